@@ -0,0 +1,115 @@
+import threading
+
+from django.core.cache import caches
+from django.db import transaction
+from .models import Schedule
+from .serializers import ScheduleSerializer
+
+TIME_FORMAT = "%H:%M:%S"
+
+_stats = {"hits": 0, "misses": 0}
+_stats_lock = threading.Lock()
+
+
+def _cache_key(doctor_id, date):
+    return f"availability:{doctor_id}:{date.isoformat()}"
+
+
+def _count(name):
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def get_day_availability(doctor_id, date):
+    # Serialized free slots for one doctor and day, read through the availability cache
+    cache = caches["availability"]
+    key = _cache_key(doctor_id, date)
+    data = cache.get(key)
+    if data is not None:
+        _count("hits")
+        return data
+
+    _count("misses")
+    schedules = Schedule.objects.filter(
+        doctor_id=doctor_id, date=date, is_available=True
+    ).order_by("start_time")
+    data = list(ScheduleSerializer(schedules, many=True).data)
+    cache.set(key, data)
+    return data
+
+
+def invalidate_availability(doctor_id, *dates):
+    # Drop the entries now and again once the surrounding transaction commits, so a
+    # read that raced the write cannot re-cache the old state; TIMEOUT bounds the rest.
+    cache = caches["availability"]
+    keys = [_cache_key(doctor_id, date) for date in dates]
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def availability_cache_stats():
+    with _stats_lock:
+        hits, misses = _stats["hits"], _stats["misses"]
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": hits / total if total else 0.0,
+    }
+
+
+def search_availability(start_date, end_date, specialty=None, doctor_ids=None):
+    # Free slots for many doctors over a date range, grouped by doctor and date,
+    # from a single projected query over the partial schedule_available_idx.
+    queryset = Schedule.objects.filter(
+        is_available=True, date__range=(start_date, end_date)
+    )
+    if doctor_ids:
+        queryset = queryset.filter(doctor_id__in=doctor_ids)
+    if specialty:
+        queryset = queryset.filter(doctor__specialty__icontains=specialty)
+
+    rows = queryset.order_by("doctor_id", "date", "start_time").values_list(
+        "id",
+        "doctor_id",
+        "date",
+        "start_time",
+        "end_time",
+        "doctor__specialty",
+        "doctor__user__first_name",
+        "doctor__user__last_name",
+    )
+
+    doctors = []
+    current_doctor = current_date = None
+    for (
+        slot_id,
+        doctor_id,
+        date,
+        start_time,
+        end_time,
+        specialty_name,
+        first_name,
+        last_name,
+    ) in rows:
+        if current_doctor is None or current_doctor["doctor_id"] != doctor_id:
+            current_doctor = {
+                "doctor_id": doctor_id,
+                "doctor_name": f"{first_name} {last_name}",
+                "specialty": specialty_name,
+                "dates": [],
+            }
+            doctors.append(current_doctor)
+            current_date = None
+        if current_date is None or current_date["date"] != date.isoformat():
+            current_date = {"date": date.isoformat(), "slots": []}
+            current_doctor["dates"].append(current_date)
+        current_date["slots"].append(
+            {
+                "id": slot_id,
+                "start_time": start_time.strftime(TIME_FORMAT),
+                "end_time": end_time.strftime(TIME_FORMAT),
+            }
+        )
+
+    return doctors
@@ -0,0 +1,57 @@
+from django.db import IntegrityError, transaction
+from .models import Schedule, Appointment
+from .availability import invalidate_availability
+from .etags import bump_appointments_version
+from .notifications import enqueue
+
+
+class SlotUnavailable(Exception):
+    pass
+
+
+def book_slot(patient, schedule):
+    # Claim the slot with a conditional UPDATE: only one concurrent request can flip
+    # is_available, and the partial unique constraint on Appointment.schedule backs it up.
+    try:
+        with transaction.atomic():
+            claimed = Schedule.objects.filter(id=schedule.id, is_available=True).update(
+                is_available=False
+            )
+            if not claimed:
+                raise SlotUnavailable("This time slot is no longer available")
+
+            appointment = Appointment.objects.create(
+                patient=patient, schedule=schedule, status="PENDING"
+            )
+            schedule.is_available = False
+            invalidate_availability(schedule.doctor_id, schedule.date)
+            enqueue(appointment, "APPOINTMENT_BOOKED")
+    except IntegrityError:
+        raise SlotUnavailable("This slot is already booked")
+
+    return appointment
+
+
+def cancel_appointment(appointment):
+    # Cancel and free the slot in one transaction; cancelling twice must not
+    # release a slot that has since been booked by someone else.
+    with transaction.atomic():
+        cancelled = (
+            Appointment.objects.filter(id=appointment.id)
+            .exclude(status="CANCELLED")
+            .update(status="CANCELLED")
+        )
+        appointment.status = "CANCELLED"
+        if not cancelled:
+            return False
+
+        Schedule.objects.filter(id=appointment.schedule_id).update(is_available=True)
+        appointment.schedule.is_available = True
+        bump_appointments_version()
+        invalidate_availability(
+            appointment.schedule.doctor_id, appointment.schedule.date
+        )
+
+        enqueue(appointment, "APPOINTMENT_CANCELLED")
+
+    return True
@@ -0,0 +1,43 @@
+from django.db.models import Count, F, Max, Q
+from .models import DataVersion, Notification
+
+APPOINTMENTS_VERSION = "appointments"
+
+
+def appointments_version():
+    # Replaced whenever an appointment, its schedule slot, or a name shown next to
+    # it changes; one primary key lookup on a row shared by every process
+    version = (
+        DataVersion.objects.filter(name=APPOINTMENTS_VERSION)
+        .values_list("version", flat=True)
+        .first()
+    )
+    return version or 0
+
+
+def bump_appointments_version():
+    # Part of the caller's transaction, so the new version and the change it
+    # stands for become visible together
+    bumped = DataVersion.objects.filter(name=APPOINTMENTS_VERSION).update(
+        version=F("version") + 1
+    )
+    if not bumped:
+        _, created = DataVersion.objects.get_or_create(
+            name=APPOINTMENTS_VERSION, defaults={"version": 1}
+        )
+        if not created:
+            bump_appointments_version()
+
+
+def notifications_version(user):
+    # Any new, deleted or read/unread-toggled notification changes this aggregate;
+    # one query over the user's notification indexes
+    return tuple(
+        Notification.objects.filter(user=user)
+        .aggregate(
+            count=Count("id"),
+            last=Max("id"),
+            unread=Count("id", filter=Q(is_read=False)),
+        )
+        .values()
+    )
@@ -0,0 +1,104 @@
+import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection
+
+from appointments.booking import book_slot, SlotUnavailable
+from appointments.notifications import drain
+from appointments.models import Doctor, Patient, Schedule, Appointment
+from core.benchmarks import benchmark_database, Timer
+from users.models import CustomUser
+
+
+class Command(BaseCommand):
+    help = "Fire parallel bookings at the same slot and report throughput and conflict rate"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=8)
+        parser.add_argument("--rounds", type=int, default=20)
+
+    def handle(self, *args, **options):
+        workers = options["workers"]
+        rounds = options["rounds"]
+
+        with benchmark_database():
+            doctor_user = CustomUser.objects.create_user(
+                email="bench-doctor@example.com", password=None, role="DOCTOR"
+            )
+            doctor = Doctor.objects.create(
+                user=doctor_user, specialty="Bench", license_number="BENCH-1"
+            )
+            patients = [
+                Patient.objects.create(
+                    user=CustomUser.objects.create_user(
+                        email=f"bench-patient-{i}@example.com", password=None
+                    )
+                )
+                for i in range(workers)
+            ]
+            start = datetime.time(8, 0)
+            schedules = [
+                Schedule.objects.create(
+                    doctor=doctor,
+                    date=datetime.date(2030, 1, 1) + datetime.timedelta(days=r),
+                    start_time=start,
+                    end_time=datetime.time(8, 15),
+                )
+                for r in range(rounds)
+            ]
+
+            counts = {"booked": 0, "conflict": 0, "error": 0}
+            lock = threading.Lock()
+
+            def attempt(patient, schedule_id):
+                schedule = Schedule.objects.select_related("doctor__user").get(
+                    id=schedule_id
+                )
+                patient = Patient.objects.select_related("user").get(id=patient.id)
+                try:
+                    book_slot(patient, schedule)
+                    outcome = "booked"
+                except SlotUnavailable:
+                    outcome = "conflict"
+                except OperationalError:
+                    outcome = "error"
+                finally:
+                    connection.close()
+                with lock:
+                    counts[outcome] += 1
+
+            with Timer() as timer:
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    for schedule in schedules:
+                        futures = [
+                            pool.submit(attempt, patient, schedule.id)
+                            for patient in patients
+                        ]
+                        for future in futures:
+                            future.result()
+
+            # Flush whatever the background worker has not delivered yet
+            drain()
+
+            double_booked = sum(
+                1
+                for schedule in schedules
+                if Appointment.objects.filter(schedule=schedule)
+                .exclude(status="CANCELLED")
+                .count()
+                > 1
+            )
+
+        attempts = workers * rounds
+        self.stdout.write(f"vendor:           {connection.vendor}")
+        self.stdout.write(f"attempts:         {attempts} ({workers} workers x {rounds} slots)")
+        self.stdout.write(f"elapsed:          {timer.elapsed:.3f}s")
+        self.stdout.write(f"throughput:       {attempts / timer.elapsed:.1f} attempts/s")
+        self.stdout.write(f"booked:           {counts['booked']}")
+        self.stdout.write(
+            f"conflict rate:    {counts['conflict'] / attempts:.1%} ({counts['conflict']})"
+        )
+        self.stdout.write(f"db errors:        {counts['error']}")
+        self.stdout.write(f"double bookings:  {double_booked}")
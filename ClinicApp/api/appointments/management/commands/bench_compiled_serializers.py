@@ -0,0 +1,72 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+
+from appointments.models import Doctor, Notification, Schedule
+from appointments.serializers import NotificationSerializer, ScheduleSerializer
+from core.benchmarks import benchmark_database, Timer
+from users.models import CustomUser
+
+
+class Command(BaseCommand):
+    help = "Compare DRF and compiled row serialization of schedules and notifications"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=5000)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        count = options["rows"]
+        with benchmark_database():
+            user = CustomUser.objects.create_user(
+                email="bench-doctor@example.com", password=None, role="DOCTOR"
+            )
+            doctor = Doctor.objects.create(
+                user=user, specialty="Bench", license_number="BENCH-1"
+            )
+            Schedule.objects.bulk_create(
+                Schedule(
+                    doctor=doctor,
+                    date=datetime.date(2030, 1, 1) + datetime.timedelta(days=i),
+                    start_time=datetime.time(9, 0),
+                    end_time=datetime.time(9, 15),
+                )
+                for i in range(count)
+            )
+            Notification.objects.bulk_create(
+                Notification(
+                    user=user,
+                    message=f"New appointment booked by Patient {i}.",
+                    notification_type="APPOINTMENT_BOOKED",
+                )
+                for i in range(count)
+            )
+
+            self.stdout.write(
+                f"{'serializer':<24}{'mode':<16}"
+                f"{'fetch+serialize rows/s':>24}{'serialize rows/s':>18}"
+            )
+            for serializer_class, queryset in (
+                (ScheduleSerializer, Schedule.objects.order_by("id")),
+                (NotificationSerializer, Notification.objects.order_by("-id")),
+            ):
+                variants = [
+                    ("instances", queryset.all),
+                    ("compiled rows", lambda: serializer_class.read_rows(queryset)),
+                ]
+                for mode, rows in variants:
+                    best_total = best_serialize = None
+                    for _ in range(options["repeat"]):
+                        with Timer() as total:
+                            objects = list(rows())
+                            with Timer() as serialize:
+                                serializer_class(objects, many=True).data
+                        best_total = min(best_total or total.elapsed, total.elapsed)
+                        best_serialize = min(
+                            best_serialize or serialize.elapsed, serialize.elapsed
+                        )
+                    self.stdout.write(
+                        f"{serializer_class.__name__:<24}{mode:<16}"
+                        f"{count / best_total:>24,.0f}"
+                        f"{count / best_serialize:>18,.0f}"
+                    )
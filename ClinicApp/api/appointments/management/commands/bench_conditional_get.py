@@ -0,0 +1,82 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+from django.test import Client
+
+from appointments.models import Appointment, Doctor, Notification, Patient, Schedule
+from core.benchmarks import benchmark_database, QueryCounter, Timer
+from users.models import CustomUser
+from users.serializers import ClinicTokenObtainPairSerializer
+
+
+class Command(BaseCommand):
+    help = "Compare full and conditional (If-None-Match) polls of the list views"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--appointments", type=int, default=2000)
+        parser.add_argument("--polls", type=int, default=200)
+        parser.add_argument("--page-size", type=int, default=100)
+
+    def handle(self, *args, **options):
+        count = options["appointments"]
+        with benchmark_database():
+            doctor = Doctor.objects.create(
+                user=CustomUser.objects.create_user(
+                    email="bench-doctor@example.com", password=None, role="DOCTOR"
+                ),
+                specialty="Bench",
+                license_number="BENCH-1",
+            )
+            patient_user = CustomUser.objects.create_user(
+                email="bench-patient@example.com", password=None
+            )
+            patient = Patient.objects.create(user=patient_user)
+            schedules = Schedule.objects.bulk_create(
+                Schedule(
+                    doctor=doctor,
+                    date=datetime.date(2030, 1, 1) + datetime.timedelta(days=i),
+                    start_time=datetime.time(9, 0),
+                    end_time=datetime.time(9, 15),
+                    is_available=False,
+                )
+                for i in range(count)
+            )
+            appointments = Appointment.objects.bulk_create(
+                Appointment(patient=patient, schedule=schedule)
+                for schedule in schedules
+            )
+            Notification.objects.bulk_create(
+                Notification(
+                    user=patient_user,
+                    message=f"Appointment {appointment.id} booked.",
+                    notification_type="APPOINTMENT_BOOKED",
+                    appointment=appointment,
+                )
+                for appointment in appointments
+            )
+
+            token = ClinicTokenObtainPairSerializer.get_token(patient_user).access_token
+            client = Client(HTTP_HOST="localhost", HTTP_AUTHORIZATION=f"Bearer {token}")
+            page_size = options["page_size"]
+            urls = [
+                f"/api/appointments/?page_size={page_size}",
+                f"/api/notifications/?page_size={page_size}",
+            ]
+
+            self.stdout.write(
+                f"{'url':<36}{'mode':<8}{'status':>7}{'queries':>9}"
+                f"{'bytes':>9}{'ms/poll':>9}"
+            )
+            for url in urls:
+                etag = client.get(url)["ETag"]
+                modes = (("full", {}), ("etag", {"HTTP_IF_NONE_MATCH": etag}))
+                for mode, headers in modes:
+                    with QueryCounter() as queries, Timer() as timer:
+                        for _ in range(options["polls"]):
+                            response = client.get(url, **headers)
+                    self.stdout.write(
+                        f"{url:<36}{mode:<8}{response.status_code:>7}"
+                        f"{queries.count / options['polls']:>9.1f}"
+                        f"{len(response.content):>9}"
+                        f"{timer.elapsed / options['polls'] * 1000:>9.2f}"
+                    )
@@ -0,0 +1,74 @@
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+
+from appointments.models import Doctor
+from appointments.serializers import DoctorSerializer, DoctorSummarySerializer
+from core.benchmarks import benchmark_database, QueryCounter, Timer
+from users.models import CustomUser
+
+
+class LegacyDoctorSerializer(serializers.ModelSerializer):
+    # The depth=1 serializer the doctor endpoints used before
+    class Meta:
+        model = Doctor
+        fields = ["id", "specialty", "license_number", "user"]
+        depth = 1
+
+
+class Command(BaseCommand):
+    help = "Compare payload size and serialization time of doctor representations"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--doctors", type=int, default=1000)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        count = options["doctors"]
+        variants = [
+            ("legacy depth=1", LegacyDoctorSerializer, lambda qs: qs),
+            (
+                "DoctorSerializer",
+                DoctorSerializer,
+                lambda qs: qs.select_related("user"),
+            ),
+            (
+                "DoctorSummarySerializer",
+                DoctorSummarySerializer,
+                DoctorSummarySerializer.setup_eager_loading,
+            ),
+        ]
+
+        with benchmark_database():
+            password = make_password("bench")
+            users = CustomUser.objects.bulk_create(
+                CustomUser(
+                    email=f"bench-doctor-{i}@example.com",
+                    first_name=f"First{i}",
+                    last_name=f"Last{i}",
+                    role="DOCTOR",
+                    password=password,
+                )
+                for i in range(count)
+            )
+            Doctor.objects.bulk_create(
+                Doctor(user=user, specialty="Cardiology", license_number=f"L-{i}")
+                for i, user in enumerate(users)
+            )
+
+            self.stdout.write(
+                f"{'representation':<26}{'queries':>9}{'bytes':>12}{'best ms':>10}"
+            )
+            for name, serializer_class, prepare in variants:
+                best = None
+                for _ in range(options["repeat"]):
+                    queryset = prepare(Doctor.objects.order_by("id"))
+                    with QueryCounter() as queries, Timer() as timer:
+                        payload = JSONRenderer().render(
+                            serializer_class(queryset, many=True).data
+                        )
+                    best = timer.elapsed if best is None else min(best, timer.elapsed)
+                self.stdout.write(
+                    f"{name:<26}{queries.count:>9}{len(payload):>12}{best * 1000:>10.1f}"
+                )
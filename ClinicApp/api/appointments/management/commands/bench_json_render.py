@@ -0,0 +1,101 @@
+import datetime
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from appointments.models import Appointment, Doctor, Patient, Schedule
+from appointments.serializers import AppointmentListSerializer, AppointmentSerializer
+from core import fastjson
+from core.benchmarks import benchmark_database, Timer
+from users.models import CustomUser
+
+
+class Command(BaseCommand):
+    help = "Compare the stock and orjson-backed JSON renderers on appointment payloads"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--appointments", type=int, default=1000)
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        if fastjson.orjson is None:
+            raise CommandError("orjson is not installed; FastJSONRenderer falls back")
+
+        count = options["appointments"]
+        with benchmark_database():
+            doctor = Doctor.objects.create(
+                user=CustomUser.objects.create_user(
+                    email="bench-doctor@example.com",
+                    password=None,
+                    role="DOCTOR",
+                    first_name="Gregory",
+                    last_name="House",
+                ),
+                specialty="Diagnostics",
+                license_number="BENCH-1",
+            )
+            patient = Patient.objects.create(
+                user=CustomUser.objects.create_user(
+                    email="bench-patient@example.com",
+                    password=None,
+                    first_name="José",
+                    last_name="Núñez",
+                ),
+                date_of_birth=datetime.date(1990, 5, 17),
+            )
+            schedules = Schedule.objects.bulk_create(
+                Schedule(
+                    doctor=doctor,
+                    date=datetime.date(2030, 1, 1) + datetime.timedelta(days=i),
+                    start_time=datetime.time(9, 0),
+                    end_time=datetime.time(9, 15),
+                    is_available=False,
+                )
+                for i in range(count)
+            )
+            Appointment.objects.bulk_create(
+                Appointment(patient=patient, schedule=schedule) for schedule in schedules
+            )
+
+            # Serialize once: the comparison is about rendering the same data
+            queryset = Appointment.objects.order_by("id")
+            payloads = [
+                (
+                    "AppointmentSerializer",
+                    AppointmentSerializer(
+                        queryset.select_related(
+                            "patient__user", "schedule__doctor__user"
+                        ),
+                        many=True,
+                    ).data,
+                ),
+                (
+                    "AppointmentListSerializer",
+                    AppointmentListSerializer(
+                        AppointmentListSerializer.setup_eager_loading(queryset),
+                        many=True,
+                    ).data,
+                ),
+            ]
+
+        self.stdout.write(
+            f"{'payload':<28}{'renderer':<20}{'bytes':>10}{'best ms':>10}{'speedup':>9}"
+        )
+        for name, data in payloads:
+            baseline = None
+            rendered = []
+            for renderer in (JSONRenderer(), fastjson.FastJSONRenderer()):
+                best = None
+                for _ in range(options["repeat"]):
+                    with Timer() as timer:
+                        content = renderer.render(data)
+                    best = timer.elapsed if best is None else min(best, timer.elapsed)
+                baseline = baseline or best
+                rendered.append(content)
+                self.stdout.write(
+                    f"{name:<28}{type(renderer).__name__:<20}{len(content):>10}"
+                    f"{best * 1000:>10.2f}{baseline / best:>8.1f}x"
+                )
+            if json.loads(rendered[0]) != json.loads(rendered[1]):
+                self.stdout.write(self.style.WARNING(f"{name}: outputs differ"))
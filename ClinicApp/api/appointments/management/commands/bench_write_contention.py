@@ -0,0 +1,85 @@
+import datetime
+import statistics
+
+from django.core.management.base import BaseCommand
+
+from appointments.booking import book_slot
+from appointments.models import Doctor, Patient, Schedule
+from appointments.notifications import drain
+from core.benchmarks import benchmark_database, database_profile, run_concurrently
+from users.models import CustomUser
+
+
+class Command(BaseCommand):
+    help = (
+        "Book slots from concurrent workers and report write throughput for the "
+        "configured database profile (see DATABASE_ENGINE in settings)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=8)
+        parser.add_argument("--operations", type=int, default=100)
+
+    def handle(self, *args, **options):
+        workers = options["workers"]
+        operations = options["operations"]
+
+        with benchmark_database():
+            doctor = Doctor.objects.create(
+                user=CustomUser.objects.create_user(
+                    email="bench-doctor@example.com", password=None, role="DOCTOR"
+                ),
+                specialty="Bench",
+                license_number="BENCH-1",
+            )
+            patients = [
+                Patient.objects.create(
+                    user=CustomUser.objects.create_user(
+                        email=f"bench-patient-{i}@example.com", password=None
+                    )
+                )
+                for i in range(workers)
+            ]
+            # Every booking gets its own slot: workers only contend for the database
+            slots = Schedule.objects.bulk_create(
+                Schedule(
+                    doctor=doctor,
+                    date=datetime.date(2030, 1, 1) + datetime.timedelta(days=i),
+                    start_time=datetime.time(9, 0),
+                    end_time=datetime.time(9, 15),
+                )
+                for i in range(workers * operations)
+            )
+            slot_ids = [slot.id for slot in slots]
+            profile = database_profile()
+
+            def book(worker, i):
+                # What AppointmentCreateView does: read the slot, then book it
+                schedule = Schedule.objects.select_related("doctor__user").get(
+                    id=slot_ids[worker * operations + i]
+                )
+                patient = Patient.objects.select_related("user").get(
+                    id=patients[worker].id
+                )
+                book_slot(patient, schedule)
+
+            elapsed, latencies, errors = run_concurrently(book, workers, operations)
+            # Flush whatever the background worker has not delivered yet
+            drain()
+
+        attempts = workers * operations
+        self.stdout.write(f"profile:     {profile}")
+        self.stdout.write(
+            f"attempts:    {attempts} ({workers} workers x {operations} bookings)"
+        )
+        self.stdout.write(f"throughput:  {len(latencies) / elapsed:.1f} bookings/s")
+        if latencies:
+            latencies = sorted(latencies)
+            p95 = latencies[int(len(latencies) * 0.95) - 1]
+            self.stdout.write(
+                f"latency:     p50 {statistics.median(latencies) * 1000:.1f} ms, "
+                f"p95 {p95 * 1000:.1f} ms, max {latencies[-1] * 1000:.1f} ms"
+            )
+        self.stdout.write(f"db errors:   {sum(errors.values())}")
+        for message, count in errors.most_common():
+            self.stdout.write(f"  {count:>6}  {message}")
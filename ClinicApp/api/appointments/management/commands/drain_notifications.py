@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from appointments.notifications import drain
+
+
+class Command(BaseCommand):
+    help = "Deliver pending notification events from the outbox"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=None,
+            help="Keep polling the outbox every INTERVAL seconds",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            delivered = drain(options["batch_size"])
+            if delivered or options["verbosity"] > 1:
+                self.stdout.write(f"Delivered {delivered} notifications")
+            if options["interval"] is None:
+                return
+            time.sleep(options["interval"])
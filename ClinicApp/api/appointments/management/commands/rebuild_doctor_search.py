@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from appointments.models import Doctor
+from appointments.search import index_doctor, invalidate_specialty_facets
+
+
+class Command(BaseCommand):
+    help = "Rebuild the doctor search term index"
+
+    def handle(self, *args, **options):
+        count = 0
+        with transaction.atomic():
+            for doctor in Doctor.objects.select_related("user").iterator():
+                index_doctor(doctor)
+                count += 1
+        invalidate_specialty_facets()
+        self.stdout.write(f"Indexed {count} doctors")
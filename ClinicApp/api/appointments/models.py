@@ -28,6 +28,15 @@ class Schedule(models.Model):
 
     class Meta:
         unique_together = ("doctor", "date", "start_time")
+        indexes = [
+            # Serves availability lookups, which only ever read free slots
+            models.Index(
+                fields=["doctor", "date", "start_time"],
+                condition=models.Q(is_available=True),
+                name="schedule_available_idx",
+            ),
+            models.Index(fields=["date", "start_time"], name="schedule_date_idx"),
+        ]
 
     def __str__(self):
         return f"{self.doctor} - {self.date} {self.start_time}"
@@ -45,6 +54,19 @@ class Appointment(models.Model):
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="PENDING")
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["status"], name="appointment_status_idx"),
+        ]
+        constraints = [
+            # A slot can hold at most one non-cancelled appointment
+            models.UniqueConstraint(
+                fields=["schedule"],
+                condition=~models.Q(status="CANCELLED"),
+                name="unique_active_appointment_per_schedule",
+            ),
+        ]
+
     def __str__(self):
         return f"{self.patient} - {self.schedule}"
 
@@ -67,6 +89,67 @@ class Notification(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["user", "-created_at", "-id"],
+                name="notification_user_recent_idx",
+            ),
+            models.Index(
+                fields=["user"],
+                condition=models.Q(is_read=False),
+                name="notification_user_unread_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user.email} - {self.message}"
+
+
+class NotificationOutbox(models.Model):
+    # Notification events written in the same transaction as the appointment change
+    # and fanned out into Notification rows by appointments.notifications.drain().
+    appointment = models.ForeignKey(Appointment, on_delete=models.CASCADE)
+    event = models.CharField(max_length=50, choices=Notification.NOTIFICATION_TYPES)
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Set by the drain() that claimed the event; NULL while it is pending
+    claim = models.UUIDField(null=True, blank=True, editable=False)
+
+    def __str__(self):
+        return f"{self.event} - {self.appointment_id}"
+
+
+class DoctorSearchTerm(models.Model):
+    # Normalized word index over doctor names and specialties, maintained by
+    # appointments.search so prefix lookups are B-tree range scans.
+    FIELD_CHOICES = (
+        ("NAME", "Name"),
+        ("SPECIALTY", "Specialty"),
+    )
+
+    doctor = models.ForeignKey(
+        Doctor, on_delete=models.CASCADE, related_name="search_terms"
+    )
+    field = models.CharField(max_length=10, choices=FIELD_CHOICES)
+    term = models.CharField(max_length=100)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["term", "doctor"], name="doctor_search_term_idx"),
+            models.Index(
+                fields=["field", "term", "doctor"], name="doctor_search_field_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.term} ({self.field}) - {self.doctor_id}"
+
+
+class DataVersion(models.Model):
+    # Named counters bumped in the same transaction as the data they describe;
+    # the ETag validators in appointments.etags read them, so every process sees
+    # a change as soon as it commits.
+    name = models.CharField(max_length=50, primary_key=True)
+    version = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name}: {self.version}"
@@ -0,0 +1,229 @@
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from collections import defaultdict
+
+from django.conf import settings
+from django.core import signing
+from django.db import OperationalError, connection, transaction
+from .models import Notification, NotificationOutbox
+from .serializers import NotificationSerializer
+
+logger = logging.getLogger(__name__)
+
+
+def build_notifications(appointment, event):
+    schedule = appointment.schedule
+    doctor_user = schedule.doctor.user
+    patient_user = appointment.patient.user
+    doctor_name = f"{doctor_user.first_name} {doctor_user.last_name}"
+    patient_name = f"{patient_user.first_name} {patient_user.last_name}"
+    when = f"on {schedule.date} at {schedule.start_time}"
+
+    if event == "APPOINTMENT_BOOKED":
+        messages = [
+            (
+                patient_user,
+                f"Your appointment with Dr. {doctor_name} {when} has been booked.",
+            ),
+            (doctor_user, f"New appointment booked by {patient_name} {when}."),
+        ]
+    elif event == "APPOINTMENT_CONFIRMED":
+        messages = [
+            (
+                patient_user,
+                f"Your appointment with Dr. {doctor_name} {when} has been confirmed.",
+            ),
+        ]
+    elif event == "APPOINTMENT_CANCELLED":
+        messages = [
+            (
+                patient_user,
+                f"Your appointment with Dr. {doctor_name} {when} has been cancelled.",
+            ),
+            (doctor_user, f"Appointment with {patient_name} {when} has been cancelled."),
+        ]
+    else:
+        raise ValueError(f"Unknown notification event: {event}")
+
+    return [
+        Notification(
+            user=user,
+            message=message,
+            notification_type=event,
+            appointment=appointment,
+        )
+        for user, message in messages
+    ]
+
+
+def enqueue(appointment, event):
+    # Record the event with the appointment change; delivery happens after commit
+    if not settings.NOTIFICATIONS_ASYNC:
+        _deliver(build_notifications(appointment, event))
+        return
+
+    NotificationOutbox.objects.create(appointment=appointment, event=event)
+    transaction.on_commit(_worker.wake)
+
+
+def _deliver(notifications):
+    Notification.objects.bulk_create(notifications)
+    transaction.on_commit(lambda: broker.publish_many(notifications))
+
+
+def drain(batch_size=None):
+    # Turn pending outbox events into Notification rows, one batch per transaction
+    batch_size = batch_size or settings.NOTIFICATIONS_BATCH_SIZE
+    delivered = 0
+    while True:
+        with transaction.atomic():
+            pending = NotificationOutbox.objects.filter(claim=None).order_by("id")
+            if connection.features.has_select_for_update_skip_locked:
+                pending = pending.select_for_update(skip_locked=True)
+            ids = list(pending.values_list("id", flat=True)[:batch_size])
+            if not ids:
+                return delivered
+
+            events = claim_events(ids)
+            notifications = [
+                notification
+                for event in events
+                for notification in build_notifications(event.appointment, event.event)
+            ]
+            _deliver(notifications)
+            NotificationOutbox.objects.filter(id__in=[e.id for e in events]).delete()
+        delivered += len(notifications)
+
+
+def claim_events(ids):
+    # Claim pending events with a conditional UPDATE. Row locks are not available
+    # everywhere (SQLite), so two drains may read the same ids; only the one whose
+    # UPDATE still finds them pending gets them, and nothing is delivered twice.
+    claim = uuid.uuid4()
+    claimed = NotificationOutbox.objects.filter(id__in=ids, claim=None).update(
+        claim=claim
+    )
+    if not claimed:
+        return []
+    return list(
+        NotificationOutbox.objects.select_related(
+            "appointment__patient__user", "appointment__schedule__doctor__user"
+        )
+        .filter(claim=claim)
+        .order_by("id")
+    )
+
+
+class NotificationBroker:
+    # In-process pub/sub feeding the notification stream. Subscribers are asyncio
+    # queues owned by the ASGI event loop; publishers may run on any thread.
+    QUEUE_SIZE = 100
+
+    def __init__(self):
+        self._subscribers = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribe(self, user_id):
+        subscription = (asyncio.get_running_loop(), asyncio.Queue(self.QUEUE_SIZE))
+        with self._lock:
+            self._subscribers[user_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, user_id, subscription):
+        with self._lock:
+            self._subscribers[user_id].discard(subscription)
+            if not self._subscribers[user_id]:
+                del self._subscribers[user_id]
+
+    def publish(self, user_id, payload):
+        with self._lock:
+            subscriptions = list(self._subscribers.get(user_id, ()))
+        for loop, queue in subscriptions:
+            loop.call_soon_threadsafe(self._put, queue, payload)
+
+    def publish_many(self, notifications):
+        for notification in notifications:
+            if notification.user_id in self._subscribers:
+                self.publish(
+                    notification.user_id, NotificationSerializer(notification).data
+                )
+
+    @staticmethod
+    def _put(queue, payload):
+        try:
+            queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            # A stalled client: end its stream so it reconnects and resumes from
+            # its last event id instead of silently missing notifications.
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(None)
+
+
+broker = NotificationBroker()
+
+
+STREAM_TICKET_SALT = "appointments.notifications.stream"
+# A ticket only opens a stream, and only for this long after it is issued
+STREAM_TICKET_SECONDS = 30
+
+
+def issue_stream_ticket(user_id, expires_at):
+    # Signed, single-purpose credential for the stream's ?ticket=, so access tokens
+    # stay out of URLs and logs; expires_at (epoch seconds) bounds the stream itself
+    return signing.dumps({"user": user_id, "exp": expires_at}, salt=STREAM_TICKET_SALT)
+
+
+def read_stream_ticket(ticket):
+    # (user_id, expires_at), or None for a forged or stale ticket
+    try:
+        data = signing.loads(
+            ticket, salt=STREAM_TICKET_SALT, max_age=STREAM_TICKET_SECONDS
+        )
+    except signing.BadSignature:
+        return None
+    return data["user"], data["exp"]
+
+
+class _OutboxWorker:
+    RETRIES = 3
+
+    def __init__(self):
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def wake(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="notification-outbox", daemon=True
+                )
+                self._thread.start()
+        self._wakeup.set()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            for attempt in range(self.RETRIES):
+                try:
+                    drain()
+                    break
+                except OperationalError:
+                    # Typically a transient lock held by a concurrent writer
+                    time.sleep(0.1 * 2**attempt)
+                except Exception:
+                    # Events stay in the outbox and are retried on the next wake-up
+                    logger.exception("Error delivering notifications")
+                    break
+                finally:
+                    connection.close()
+            else:
+                logger.error("Giving up delivering notifications until next wake-up")
+
+
+_worker = _OutboxWorker()
@@ -0,0 +1,101 @@
+import difflib
+import re
+import unicodedata
+
+from django.core.cache import cache
+from django.db.models import Count
+from .models import Doctor, DoctorSearchTerm
+
+SPECIALTIES_CACHE_KEY = "doctors:specialties"
+SPECIALTIES_CACHE_TIMEOUT = 60 * 60
+FUZZY_CUTOFF = 0.75
+
+# Upper bound for prefix range scans: term >= prefix AND term < prefix + MAX_CHAR
+MAX_CHAR = "\U0010ffff"
+
+
+def normalize(text):
+    # Lowercase, strip accents and split into words: "Cardiología" -> ["cardiologia"]
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return re.findall(r"\w+", text.lower())
+
+
+def index_doctor(doctor):
+    user = doctor.user
+    terms = {("NAME", term) for term in normalize(f"{user.first_name} {user.last_name}")}
+    terms |= {("SPECIALTY", term) for term in normalize(doctor.specialty)}
+
+    DoctorSearchTerm.objects.filter(doctor=doctor).delete()
+    DoctorSearchTerm.objects.bulk_create(
+        DoctorSearchTerm(doctor=doctor, field=field, term=term[:100])
+        for field, term in terms
+    )
+
+
+def _prefix(queryset, token):
+    return queryset.filter(term__gte=token, term__lt=token + MAX_CHAR)
+
+
+def _matching_doctors(tokens, field=None, fuzzy=False):
+    terms = DoctorSearchTerm.objects.all()
+    if field:
+        terms = terms.filter(field=field)
+
+    doctor_ids = None
+    for token in tokens:
+        if fuzzy:
+            # Compare against known words sharing the first letter
+            candidates = _prefix(terms, token[0]).values_list("term", flat=True)
+            close = difflib.get_close_matches(
+                token, set(candidates), n=5, cutoff=FUZZY_CUTOFF
+            )
+            matches = terms.filter(term__in=close)
+        else:
+            matches = _prefix(terms, token)
+        ids = set(matches.values_list("doctor_id", flat=True))
+        doctor_ids = ids if doctor_ids is None else doctor_ids & ids
+        if not doctor_ids:
+            return set()
+    return doctor_ids
+
+
+def search_doctors(query="", specialty=""):
+    # Every word must prefix-match a name or specialty word; when nothing matches,
+    # retry with typo-tolerant matching against the indexed vocabulary.
+    query_tokens = normalize(query)
+    specialty_tokens = normalize(specialty)
+
+    queryset = Doctor.objects.select_related("user").order_by(
+        "user__last_name", "user__first_name", "id"
+    )
+    if not query_tokens and not specialty_tokens:
+        return queryset
+
+    for fuzzy in (False, True):
+        doctor_ids = None
+        for tokens, field in ((query_tokens, None), (specialty_tokens, "SPECIALTY")):
+            if not tokens:
+                continue
+            ids = _matching_doctors(tokens, field, fuzzy)
+            doctor_ids = ids if doctor_ids is None else doctor_ids & ids
+        if doctor_ids:
+            break
+
+    return queryset.filter(id__in=doctor_ids)
+
+
+def specialty_facets():
+    facets = cache.get(SPECIALTIES_CACHE_KEY)
+    if facets is None:
+        facets = list(
+            Doctor.objects.values("specialty")
+            .annotate(count=Count("id"))
+            .order_by("specialty")
+        )
+        cache.set(SPECIALTIES_CACHE_KEY, facets, SPECIALTIES_CACHE_TIMEOUT)
+    return facets
+
+
+def invalidate_specialty_facets():
+    cache.delete(SPECIALTIES_CACHE_KEY)
@@ -1,17 +1,46 @@
 from rest_framework import serializers
+from core.compiled import CompiledListSerializer, CompiledReadMixin
 from .models import Doctor, Schedule, Appointment, Notification
 from users.models import CustomUser
 from django.utils import timezone
 
 
+class DoctorUserSerializer(serializers.ModelSerializer):
+    # Public user fields only; depth=1 used to ship the password hash and permissions
+    class Meta:
+        model = CustomUser
+        fields = ["id", "email", "first_name", "last_name"]
+        read_only_fields = fields
+
+
 class DoctorSerializer(serializers.ModelSerializer):
+    user = DoctorUserSerializer(read_only=True)
+
     class Meta:
         model = Doctor
         fields = ["id", "specialty", "license_number", "user"]
-        depth = 1  # To include schedule details
 
 
-class ScheduleSerializer(serializers.ModelSerializer):
+class DoctorSummarySerializer(serializers.ModelSerializer):
+    # Compact listing representation; pair with setup_eager_loading()
+    name = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Doctor
+        fields = ["id", "name", "specialty"]
+        read_only_fields = fields
+
+    @staticmethod
+    def setup_eager_loading(queryset):
+        return queryset.select_related("user").only(
+            "id", "specialty", "user__first_name", "user__last_name"
+        )
+
+    def get_name(self, obj):
+        return f"{obj.user.first_name} {obj.user.last_name}"
+
+
+class ScheduleSerializer(CompiledReadMixin, serializers.ModelSerializer):
     start_time = serializers.TimeField(
         format="%H:%M:%S", input_formats=["%H:%M", "%H:%M:%S"]
     )
@@ -23,6 +52,7 @@ class ScheduleSerializer(serializers.ModelSerializer):
         model = Schedule
         fields = "__all__"
         read_only_fields = ["is_available", "doctor"]
+        list_serializer_class = CompiledListSerializer
 
     def validate(self, data):
         if data["start_time"] >= data["end_time"]:
@@ -30,6 +60,46 @@ class ScheduleSerializer(serializers.ModelSerializer):
         return data
 
 
+class ScheduleBreakSerializer(serializers.Serializer):
+    start = serializers.TimeField(input_formats=["%H:%M", "%H:%M:%S"])
+    end = serializers.TimeField(input_formats=["%H:%M", "%H:%M:%S"])
+
+    def validate(self, data):
+        if data["start"] >= data["end"]:
+            raise serializers.ValidationError("Break start must be before break end")
+        return data
+
+
+class ScheduleTemplateSerializer(serializers.Serializer):
+    MAX_DAYS = 366
+
+    doctor = serializers.PrimaryKeyRelatedField(
+        queryset=Doctor.objects.all(), required=False
+    )
+    start_date = serializers.DateField()
+    end_date = serializers.DateField()
+    weekdays = serializers.ListField(
+        child=serializers.IntegerField(min_value=0, max_value=6),
+        allow_empty=False,
+        help_text="0 = Monday ... 6 = Sunday",
+    )
+    day_start = serializers.TimeField(input_formats=["%H:%M", "%H:%M:%S"])
+    day_end = serializers.TimeField(input_formats=["%H:%M", "%H:%M:%S"])
+    slot_minutes = serializers.IntegerField(min_value=5, max_value=480)
+    breaks = ScheduleBreakSerializer(many=True, required=False, default=list)
+
+    def validate(self, data):
+        if data["start_date"] > data["end_date"]:
+            raise serializers.ValidationError("Start date must be before end date")
+        if (data["end_date"] - data["start_date"]).days >= self.MAX_DAYS:
+            raise serializers.ValidationError(
+                f"Date range cannot exceed {self.MAX_DAYS} days"
+            )
+        if data["day_start"] >= data["day_end"]:
+            raise serializers.ValidationError("Start time must be before end time")
+        return data
+
+
 class AppointmentSerializer(serializers.ModelSerializer):
     doctor_name = serializers.SerializerMethodField()
     patient_name = serializers.SerializerMethodField()
@@ -68,13 +138,78 @@ class AppointmentSerializer(serializers.ModelSerializer):
                     "This time slot is no longer available"
                 )
 
-            if Appointment.objects.filter(schedule=schedule).exists():
+            if (
+                Appointment.objects.filter(schedule=schedule)
+                .exclude(status="CANCELLED")
+                .exists()
+            ):
                 raise serializers.ValidationError("This slot is already booked")
 
         return data
 
 
-class NotificationSerializer(serializers.ModelSerializer):
+class AppointmentListSerializer(serializers.ModelSerializer):
+    # Flat, read-only representation for list endpoints. Pair it with
+    # setup_eager_loading() so a page is fetched in one joined query.
+    schedule = serializers.IntegerField(source="schedule_id")
+    date = serializers.DateField(source="schedule.date")
+    start_time = serializers.TimeField(source="schedule.start_time", format="%H:%M:%S")
+    end_time = serializers.TimeField(source="schedule.end_time", format="%H:%M:%S")
+    doctor = serializers.IntegerField(source="schedule.doctor_id")
+    doctor_name = serializers.SerializerMethodField()
+    specialty = serializers.CharField(source="schedule.doctor.specialty")
+    patient = serializers.IntegerField(source="patient_id")
+    patient_name = serializers.SerializerMethodField()
+    patient_email = serializers.EmailField(source="patient.user.email")
+
+    class Meta:
+        model = Appointment
+        fields = [
+            "id",
+            "status",
+            "created_at",
+            "schedule",
+            "date",
+            "start_time",
+            "end_time",
+            "doctor",
+            "doctor_name",
+            "specialty",
+            "patient",
+            "patient_name",
+            "patient_email",
+        ]
+        read_only_fields = fields
+
+    @staticmethod
+    def setup_eager_loading(queryset):
+        return queryset.select_related(
+            "patient__user", "schedule__doctor__user"
+        ).only(
+            "id",
+            "status",
+            "created_at",
+            "schedule__date",
+            "schedule__start_time",
+            "schedule__end_time",
+            "schedule__doctor__specialty",
+            "schedule__doctor__user__first_name",
+            "schedule__doctor__user__last_name",
+            "patient__user__first_name",
+            "patient__user__last_name",
+            "patient__user__email",
+        )
+
+    def get_doctor_name(self, obj):
+        user = obj.schedule.doctor.user
+        return f"{user.first_name} {user.last_name}"
+
+    def get_patient_name(self, obj):
+        user = obj.patient.user
+        return f"{user.first_name} {user.last_name}"
+
+
+class NotificationSerializer(CompiledReadMixin, serializers.ModelSerializer):
     class Meta:
         model = Notification
         fields = [
@@ -86,3 +221,18 @@ class NotificationSerializer(serializers.ModelSerializer):
             "created_at",
         ]
         read_only_fields = ["id", "created_at"]
+        list_serializer_class = CompiledListSerializer
+
+
+class NotificationMarkReadSerializer(serializers.Serializer):
+    MAX_IDS = 1000
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(), required=False, max_length=MAX_IDS
+    )
+    up_to = serializers.IntegerField(required=False)
+
+    def validate(self, data):
+        if ("ids" in data) == ("up_to" in data):
+            raise serializers.ValidationError("Provide either ids or up_to")
+        return data
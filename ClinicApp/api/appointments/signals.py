@@ -0,0 +1,51 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from users.authentication import invalidate_cached_user
+from users.models import CustomUser
+from .etags import bump_appointments_version
+from .models import Appointment, Doctor, Patient, Schedule
+from .search import index_doctor, invalidate_specialty_facets
+
+
+# Keep the doctor search index and specialty facets in step with profile edits
+@receiver(post_save, sender=Doctor)
+def doctor_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    index_doctor(instance)
+    invalidate_specialty_facets()
+
+
+@receiver(post_delete, sender=Doctor)
+def doctor_deleted(sender, instance, **kwargs):
+    invalidate_specialty_facets()
+
+
+# Cached authenticated users carry their doctor/patient ids
+@receiver(post_save, sender=Doctor)
+@receiver(post_delete, sender=Doctor)
+@receiver(post_save, sender=Patient)
+@receiver(post_delete, sender=Patient)
+def profile_changed(sender, instance, **kwargs):
+    invalidate_cached_user(instance.user_id)
+
+
+@receiver(post_save, sender=CustomUser)
+def doctor_user_saved(sender, instance, raw=False, **kwargs):
+    if raw or instance.role != "DOCTOR":
+        return
+    doctor = Doctor.objects.filter(user=instance).first()
+    if doctor:
+        index_doctor(doctor)
+
+
+# Appointment lists show statuses, slot dates and times, plus doctor/patient
+# names and specialties
+@receiver(post_save, sender=Appointment)
+@receiver(post_delete, sender=Appointment)
+@receiver(post_save, sender=Schedule)
+@receiver(post_delete, sender=Schedule)
+@receiver(post_save, sender=Doctor)
+@receiver(post_save, sender=CustomUser)
+def appointment_data_changed(sender, **kwargs):
+    bump_appointments_version()
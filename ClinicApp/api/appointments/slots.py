@@ -0,0 +1,54 @@
+import datetime
+
+from django.db import transaction
+from .models import Schedule
+from .availability import invalidate_availability
+from .etags import bump_appointments_version
+
+
+def expand_slots(
+    doctor, start_date, end_date, weekdays, day_start, day_end, slot_minutes, breaks=()
+):
+    # Expand a weekly template into unsaved Schedule rows. A slot is skipped if it
+    # overlaps a break or would run past the end of the working day.
+    length = datetime.timedelta(minutes=slot_minutes)
+    day = start_date
+    while day <= end_date:
+        if day.weekday() in weekdays:
+            current = datetime.datetime.combine(day, day_start)
+            day_end_at = datetime.datetime.combine(day, day_end)
+            while current + length <= day_end_at:
+                slot_start = current.time()
+                slot_end = (current + length).time()
+                if not any(
+                    slot_start < break_end and slot_end > break_start
+                    for break_start, break_end in breaks
+                ):
+                    yield Schedule(
+                        doctor=doctor,
+                        date=day,
+                        start_time=slot_start,
+                        end_time=slot_end,
+                        is_available=True,
+                    )
+                current += length
+        day += datetime.timedelta(days=1)
+
+
+def generate_slots(doctor, start_date, end_date, **template):
+    # Insert the whole range in one statement; rows that collide with the
+    # unique (doctor, date, start_time) constraint are skipped by the database.
+    slots = list(expand_slots(doctor, start_date, end_date, **template))
+    existing = Schedule.objects.filter(
+        doctor=doctor, date__range=(start_date, end_date)
+    )
+    with transaction.atomic():
+        before = existing.count()
+        Schedule.objects.bulk_create(slots, ignore_conflicts=True)
+        created = existing.count() - before
+        if created:
+            # bulk_create() sends no post_save
+            bump_appointments_version()
+            invalidate_availability(doctor.id, *{slot.date for slot in slots})
+
+    return {"created": created, "skipped": len(slots) - created}
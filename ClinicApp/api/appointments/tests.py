@@ -1,3 +1,901 @@
-from django.test import TestCase
+import asyncio
+import datetime
+import decimal
+import io
+import json
+import time
+import uuid
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.db import IntegrityError, transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from core import fastjson
+from core.compiled import CompiledReadMixin
+from core.fastjson import FastJSONParser, FastJSONRenderer
+from users.models import CustomUser
+from users.serializers import ClinicTokenObtainPairSerializer
+from .booking import book_slot, cancel_appointment, SlotUnavailable
+from .models import (
+    Doctor,
+    Patient,
+    Schedule,
+    Appointment,
+    Notification,
+    NotificationOutbox,
+)
+from .notifications import claim_events, drain, issue_stream_ticket
+from .pagination import AppointmentKeysetPagination
+from .slots import generate_slots
+from .views import AppointmentExportView
+from .serializers import NotificationSerializer, ScheduleSerializer
+
+
+@override_settings(NOTIFICATIONS_ASYNC=False)
+class ClinicTestCase(TestCase):
+    def setUp(self):
+        caches["availability"].clear()
+        caches["default"].clear()
+        caches["auth"].clear()
+        self.doctor_user = CustomUser.objects.create_user(
+            email="doctor@example.com",
+            password="pass",
+            first_name="Gregory",
+            last_name="House",
+            role="DOCTOR",
+        )
+        self.doctor = Doctor.objects.create(
+            user=self.doctor_user, specialty="Diagnostics", license_number="L-1"
+        )
+        self.patient_user = CustomUser.objects.create_user(
+            email="patient@example.com",
+            password="pass",
+            first_name="Jane",
+            last_name="Doe",
+        )
+        self.patient = Patient.objects.create(user=self.patient_user)
+        self.other_patient = Patient.objects.create(
+            user=CustomUser.objects.create_user(
+                email="other@example.com", password="pass"
+            )
+        )
+        self.schedule = Schedule.objects.create(
+            doctor=self.doctor,
+            date=datetime.date(2030, 1, 1),
+            start_time=datetime.time(9, 0),
+            end_time=datetime.time(9, 15),
+        )
+
+    def add_appointments(self, count):
+        start = Schedule.objects.count()
+        for i in range(start, start + count):
+            schedule = Schedule.objects.create(
+                doctor=self.doctor,
+                date=datetime.date(2031, 1, 1) + datetime.timedelta(days=i),
+                start_time=datetime.time(9, 0),
+                end_time=datetime.time(9, 15),
+                is_available=False,
+            )
+            Appointment.objects.create(patient=self.patient, schedule=schedule)
+
+    def token_client(self, user):
+        # Authenticates like the UI does, with a token carrying the role claims
+        client = APIClient()
+        token = ClinicTokenObtainPairSerializer.get_token(user).access_token
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        return client
+
+    def assertConstantQueries(self, user, url, num, sizes=(1, 10)):
+        # Grow the data set and check the endpoint's query count does not follow it
+        client = self.token_client(user)
+        for size in sizes:
+            self.add_appointments(size - Appointment.objects.count())
+            with self.subTest(size=size), self.assertNumQueries(num):
+                response = client.get(url)
+                self.assertEqual(response.status_code, 200)
+
+
+class BookingTests(ClinicTestCase):
+    def test_book_slot_claims_schedule(self):
+        appointment = book_slot(self.patient, self.schedule)
+
+        self.schedule.refresh_from_db()
+        self.assertFalse(self.schedule.is_available)
+        self.assertEqual(appointment.status, "PENDING")
+        self.assertEqual(
+            Notification.objects.filter(appointment=appointment).count(), 2
+        )
+
+    def test_second_booking_is_rejected(self):
+        book_slot(self.patient, self.schedule)
+
+        with self.assertRaises(SlotUnavailable):
+            book_slot(self.other_patient, self.schedule)
+        self.assertEqual(Appointment.objects.count(), 1)
+
+    def test_unique_active_appointment_constraint(self):
+        Appointment.objects.create(patient=self.patient, schedule=self.schedule)
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Appointment.objects.create(
+                patient=self.other_patient, schedule=self.schedule
+            )
+
+    def test_cancel_frees_slot_for_rebooking(self):
+        appointment = book_slot(self.patient, self.schedule)
+
+        self.assertTrue(cancel_appointment(appointment))
+        self.assertFalse(cancel_appointment(appointment))
+
+        rebooked = book_slot(self.other_patient, self.schedule)
+        self.assertEqual(rebooked.status, "PENDING")
+
+    def test_create_view_rejects_taken_slot(self):
+        book_slot(self.other_patient, self.schedule)
+        client = APIClient()
+        client.force_authenticate(self.patient_user)
+
+        response = client.post(
+            "/api/appointments/create/", {"schedule": self.schedule.id}
+        )
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_cancelled_appointment_cannot_be_reopened(self):
+        client = APIClient()
+        client.force_authenticate(self.doctor_user)
+        for rebook in (False, True):
+            with self.subTest(rebooked=rebook):
+                Appointment.objects.all().delete()
+                Schedule.objects.filter(id=self.schedule.id).update(is_available=True)
+                appointment = book_slot(self.patient, self.schedule)
+                cancel_appointment(appointment)
+                if rebook:
+                    book_slot(self.other_patient, self.schedule)
+
+                for status in ("PENDING", "CONFIRMED"):
+                    response = client.patch(
+                        f"/api/appointments/{appointment.id}/",
+                        {"status": status},
+                        format="json",
+                    )
+                    self.assertEqual(response.status_code, 400)
+
+                appointment.refresh_from_db()
+                self.assertEqual(appointment.status, "CANCELLED")
+                self.schedule.refresh_from_db()
+                self.assertEqual(self.schedule.is_available, not rebook)
+
+
+class ScheduleCreateTests(ClinicTestCase):
+    payload = {"date": "2030-01-02", "start_time": "09:00", "end_time": "09:30"}
+
+    def test_doctor_creates_schedule(self):
+        client = self.token_client(self.doctor_user)
+        response = client.post("/api/schedules/", self.payload, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["doctor"], self.doctor.id)
+
+    def test_deactivated_doctor_cannot_create_schedules(self):
+        client = self.token_client(self.doctor_user)
+        self.doctor_user.is_active = False
+        self.doctor_user.save()
+
+        response = client.post("/api/schedules/", self.payload, format="json")
+        self.assertEqual(response.status_code, 401)
+        self.assertFalse(Schedule.objects.filter(date="2030-01-02").exists())
+
+    def test_deleted_doctor_cannot_create_schedules(self):
+        client = self.token_client(self.doctor_user)
+        self.doctor_user.delete()
+
+        response = client.post("/api/schedules/", self.payload, format="json")
+        self.assertEqual(response.status_code, 401)
+
+
+class ScheduleGenerateTests(ClinicTestCase):
+    def test_generate_expands_template_and_skips_existing(self):
+        client = APIClient()
+        client.force_authenticate(self.doctor_user)
+        payload = {
+            "start_date": "2030-01-01",
+            "end_date": "2030-01-07",
+            "weekdays": [1, 3],  # 2030-01-01 is a Tuesday
+            "day_start": "09:00",
+            "day_end": "11:00",
+            "slot_minutes": 15,
+            "breaks": [{"start": "10:00", "end": "10:30"}],
+        }
+
+        response = client.post("/api/schedules/generate/", payload, format="json")
+
+        # 6 slots per day on two days, one of which already exists
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data, {"created": 11, "skipped": 1})
+        self.assertFalse(
+            Schedule.objects.filter(start_time=datetime.time(10, 15)).exists()
+        )
+
+        response = client.post("/api/schedules/generate/", payload, format="json")
+        self.assertEqual(response.data, {"created": 0, "skipped": 12})
+
+
+class AvailabilitySearchTests(ClinicTestCase):
+    def test_search_groups_free_slots_by_doctor_and_date(self):
+        Schedule.objects.create(
+            doctor=self.doctor,
+            date=datetime.date(2030, 1, 2),
+            start_time=datetime.time(9, 0),
+            end_time=datetime.time(9, 15),
+        )
+        Schedule.objects.create(
+            doctor=self.doctor,
+            date=datetime.date(2030, 1, 2),
+            start_time=datetime.time(9, 15),
+            end_time=datetime.time(9, 30),
+            is_available=False,
+        )
+
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                "/api/doctors/availability/search/",
+                {
+                    "specialty": "diag",
+                    "start_date": "2030-01-01",
+                    "end_date": "2030-01-03",
+                },
+            )
+
+        self.assertEqual(response.status_code, 200)
+        (doctor,) = response.json()
+        self.assertEqual(doctor["doctor_id"], self.doctor.id)
+        self.assertEqual(doctor["doctor_name"], "Gregory House")
+        self.assertEqual(
+            [(d["date"], len(d["slots"])) for d in doctor["dates"]],
+            [("2030-01-01", 1), ("2030-01-02", 1)],
+        )
+
+    def test_search_rejects_invalid_dates(self):
+        for value in ("garbage", "2030-02-30"):
+            with self.subTest(value=value):
+                response = self.client.get(
+                    "/api/doctors/availability/search/", {"start_date": value}
+                )
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("start_date", response.json())
+
+
+class AvailabilityCacheTests(ClinicTestCase):
+    def url(self):
+        return f"/api/doctors/availability/{self.doctor.id}/?date=2030-01-01"
+
+    def test_reads_are_cached_and_booking_invalidates(self):
+        response = self.client.get(self.url())
+        self.assertEqual([s["id"] for s in response.json()], [self.schedule.id])
+
+        with self.assertNumQueries(0):
+            self.client.get(self.url())
+
+        book_slot(self.patient, self.schedule)
+        self.assertEqual(self.client.get(self.url()).json(), [])
+
+        cancel_appointment(Appointment.objects.get())
+        self.assertEqual(len(self.client.get(self.url()).json()), 1)
+
+    def test_schedule_delete_invalidates(self):
+        self.client.get(self.url())
+        client = APIClient()
+        client.force_authenticate(self.doctor_user)
+
+        client.delete(f"/api/schedules/{self.schedule.id}/")
+
+        self.assertEqual(self.client.get(self.url()).json(), [])
+
+    def test_invalid_dates_are_rejected(self):
+        for value in ("garbage", "2030-02-30"):
+            with self.subTest(value=value):
+                response = self.client.get(
+                    f"/api/doctors/availability/{self.doctor.id}/", {"date": value}
+                )
+                self.assertEqual(response.status_code, 400)
+
+
+class NotificationOutboxTests(ClinicTestCase):
+    @override_settings(NOTIFICATIONS_ASYNC=True)
+    def test_booking_defers_notifications_to_outbox(self):
+        appointment = book_slot(self.patient, self.schedule)
+
+        self.assertEqual(Notification.objects.count(), 0)
+        self.assertEqual(NotificationOutbox.objects.count(), 1)
+
+        # Per batch: read pending ids, claim them, one joined read, one insert and
+        # one delete; then an empty probe
+        with self.assertNumQueries(10):
+            self.assertEqual(drain(), 2)
+
+        self.assertEqual(NotificationOutbox.objects.count(), 0)
+        messages = dict(
+            Notification.objects.filter(appointment=appointment).values_list(
+                "user_id", "message"
+            )
+        )
+        self.assertEqual(
+            messages[self.patient_user.id],
+            "Your appointment with Dr. Gregory House on 2030-01-01 at 09:00:00 has been booked.",
+        )
+        self.assertEqual(
+            messages[self.doctor_user.id],
+            "New appointment booked by Jane Doe on 2030-01-01 at 09:00:00.",
+        )
+
+
+    @override_settings(NOTIFICATIONS_ASYNC=True)
+    def test_events_are_claimed_once(self):
+        book_slot(self.patient, self.schedule)
+        ids = list(NotificationOutbox.objects.values_list("id", flat=True))
+
+        # A concurrent drain that read the same ids gets nothing
+        self.assertEqual(len(claim_events(ids)), 1)
+        self.assertEqual(claim_events(ids), [])
+
+        # Claimed events are not picked up again
+        self.assertEqual(drain(), 0)
+        self.assertEqual(Notification.objects.count(), 0)
+
+
+class NotificationStreamTests(ClinicTestCase):
+    async def read_event(self, stream):
+        return (await asyncio.wait_for(anext(stream), 5)).decode()
+
+    async def get_ticket(self, user):
+        token = AccessToken.for_user(user)
+        response = await self.async_client.post(
+            "/api/notifications/stream/ticket/",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()["ticket"]
+
+    async def test_stream_replays_backlog_then_pushes_new_notifications(self):
+        old = await Notification.objects.acreate(
+            user=self.patient_user, message="old", notification_type="APPOINTMENT_BOOKED"
+        )
+        missed = await Notification.objects.acreate(
+            user=self.patient_user,
+            message="missed",
+            notification_type="APPOINTMENT_BOOKED",
+        )
+        ticket = await self.get_ticket(self.patient_user)
+
+        response = await self.async_client.get(
+            "/api/notifications/stream/",
+            {"ticket": ticket},
+            headers={"Last-Event-ID": str(old.id)},
+        )
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        stream = aiter(response.streaming_content)
+
+        self.assertIn(f"id: {missed.id}\n", await self.read_event(stream))
+
+        def book():
+            with self.captureOnCommitCallbacks(execute=True):
+                book_slot(self.patient, self.schedule)
+
+        await sync_to_async(book)()
+        event = await self.read_event(stream)
+        self.assertIn("event: notification\n", event)
+        self.assertIn("has been booked.", event)
+        await stream.aclose()
+
+    async def test_stream_requires_ticket(self):
+        token = str(AccessToken.for_user(self.patient_user))
+        for params in ({}, {"token": token}, {"ticket": token}):
+            with self.subTest(params=list(params)):
+                response = await self.async_client.get(
+                    "/api/notifications/stream/", params
+                )
+                self.assertEqual(response.status_code, 401)
+
+    async def test_stale_tickets_are_rejected(self):
+        ticket = await self.get_ticket(self.patient_user)
+        with mock.patch("time.time", return_value=time.time() + 31):
+            response = await self.async_client.get(
+                "/api/notifications/stream/", {"ticket": ticket}
+            )
+        self.assertEqual(response.status_code, 401)
+
+    async def test_stream_ends_when_the_access_token_expires(self):
+        ticket = issue_stream_ticket(self.patient_user.id, time.time() + 0.2)
+        response = await self.async_client.get(
+            "/api/notifications/stream/", {"ticket": ticket}
+        )
+        stream = aiter(response.streaming_content)
+        with self.assertRaises(StopAsyncIteration):
+            while True:
+                await self.read_event(stream)
+
+    def test_stream_is_not_served_under_wsgi(self):
+        self.client.force_login(self.patient_user)
+        response = self.client.post("/api/notifications/stream/ticket/")
+        self.assertEqual(response.status_code, 204)
+
+        ticket = issue_stream_ticket(self.patient_user.id, time.time() + 60)
+        response = self.client.get("/api/notifications/stream/", {"ticket": ticket})
+        self.assertEqual(response.status_code, 204)
+
+
+class NotificationListTests(ClinicTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(self.patient_user)
+        Notification.objects.bulk_create(
+            Notification(
+                user=self.patient_user,
+                message=f"message {i}",
+                notification_type="APPOINTMENT_BOOKED",
+                is_read=i % 2 == 0,
+            )
+            for i in range(5)
+        )
+
+    def test_cursor_pagination_walks_newest_first(self):
+        response = self.client.get("/api/notifications/", {"page_size": 2})
+        ids = [n["id"] for n in response.data["results"]]
+
+        while response.data["next"]:
+            response = self.client.get(response.data["next"])
+            ids += [n["id"] for n in response.data["results"]]
+
+        self.assertEqual(
+            ids,
+            list(
+                Notification.objects.order_by("-created_at", "-id").values_list(
+                    "id", flat=True
+                )
+            ),
+        )
+
+    def test_since_and_unread_count(self):
+        latest = Notification.objects.order_by("-created_at", "-id").first()
+        response = self.client.get(
+            "/api/notifications/", {"since": latest.created_at.isoformat()}
+        )
+        self.assertEqual(response.data["results"], [])
+
+        response = self.client.get("/api/notifications/unread-count/")
+        self.assertEqual(response.data, {"unread_count": 2})
+
+    def test_bulk_mark_read_is_scoped_to_user(self):
+        other = Notification.objects.create(
+            user=self.doctor_user, message="x", notification_type="APPOINTMENT_BOOKED"
+        )
+        newest = Notification.objects.filter(user=self.patient_user).latest("id")
+
+        with self.assertNumQueries(1):
+            response = self.client.post(
+                "/api/notifications/mark-read/",
+                {"up_to": other.id},
+                format="json",
+            )
+
+        self.assertEqual(response.data, {"updated": 2})
+        self.assertFalse(Notification.objects.get(id=other.id).is_read)
+        self.assertFalse(
+            Notification.objects.filter(user=self.patient_user, is_read=False).exists()
+        )
+
+        response = self.client.post(
+            "/api/notifications/mark-read/",
+            {"ids": [newest.id], "up_to": newest.id},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+class AppointmentListTests(ClinicTestCase):
+    def test_list_queries_do_not_grow_with_results(self):
+        # The ETag version lookup plus one joined page query
+        for user in (self.patient_user, self.doctor_user):
+            self.assertConstantQueries(user, "/api/appointments/", 2)
+
+    def test_list_is_flat(self):
+        self.add_appointments(1)
+        client = APIClient()
+        client.force_authenticate(self.patient_user)
+
+        (appointment,) = client.get("/api/appointments/").json()["results"]
+
+        self.assertEqual(appointment["doctor_name"], "Gregory House")
+        self.assertEqual(appointment["specialty"], "Diagnostics")
+        self.assertEqual(appointment["patient_email"], "patient@example.com")
+        self.assertEqual(appointment["start_time"], "09:00:00")
+
+    def test_keyset_pages_cover_history_in_order(self):
+        self.add_appointments(7)
+        client = self.token_client(self.patient_user)
+
+        ids = []
+        url = "/api/appointments/?page_size=3"
+        while url:
+            with self.assertNumQueries(2):
+                data = client.get(url).json()
+            ids += [a["id"] for a in data["results"]]
+            url = data["next"]
+
+        self.assertEqual(
+            ids,
+            list(
+                Appointment.objects.order_by(
+                    "schedule__date", "schedule__start_time", "id"
+                ).values_list("id", flat=True)
+            ),
+        )
+
+    def test_filters(self):
+        self.add_appointments(3)
+        Appointment.objects.filter(schedule__date="2031-01-03").update(
+            status="CONFIRMED"
+        )
+        client = APIClient()
+        client.force_authenticate(self.patient_user)
+
+        response = client.get(
+            "/api/appointments/",
+            {"start_date": "2031-01-03", "status": "confirmed,pending"},
+        )
+        self.assertEqual(
+            [(a["date"], a["status"]) for a in response.json()["results"]],
+            [("2031-01-03", "CONFIRMED"), ("2031-01-04", "PENDING")],
+        )
+
+        response = client.get("/api/appointments/", {"status": "UNKNOWN"})
+        self.assertEqual(response.status_code, 400)
+
+        for value in ("garbage", "2030-02-30"):
+            with self.subTest(value=value):
+                response = client.get("/api/appointments/", {"date": value})
+                self.assertEqual(response.status_code, 400)
+
+    def test_forged_cursors_are_not_found(self):
+        self.add_appointments(2)
+        client = self.token_client(self.patient_user)
+        pagination = AppointmentKeysetPagination()
+        for position in (
+            ["2031-01-01", "09:00:00", "abc"],
+            ["2031-01-01", "09:00:00", [1]],
+            ["2030-02-30", "09:00:00", "1"],
+        ):
+            with self.subTest(position=position):
+                response = client.get(
+                    "/api/appointments/",
+                    {"cursor": pagination.encode_cursor(position)},
+                )
+                self.assertEqual(response.status_code, 404)
+
+    def test_export_streams_csv_and_ndjson(self):
+        self.add_appointments(2)
+        client = APIClient()
+        client.force_authenticate(self.patient_user)
+
+        response = client.get("/api/appointments/export/")
+        self.assertTrue(response.streaming)
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0].split(",")[:3], ["id", "date", "start_time"])
+        self.assertEqual(len(lines), 3)
+        self.assertIn("2031-01-02,09:00:00,09:15:00,PENDING", lines[1])
+
+        response = client.get("/api/appointments/export/", {"output": "ndjson"})
+        rows = [
+            json.loads(line)
+            for line in b"".join(response.streaming_content).decode().splitlines()
+        ]
+        self.assertEqual([r["date"] for r in rows], ["2031-01-02", "2031-01-03"])
+        self.assertEqual(rows[0]["patient_email"], "patient@example.com")
+
+    def test_export_quotes_formula_cells(self):
+        self.add_appointments(1)
+        CustomUser.objects.filter(pk=self.patient_user.pk).update(
+            first_name="=HYPERLINK(1)", last_name="-2+3"
+        )
+        client = APIClient()
+        client.force_authenticate(self.patient_user)
+
+        response = client.get("/api/appointments/export/")
+        line = b"".join(response.streaming_content).decode().splitlines()[1]
+        self.assertIn(",'=HYPERLINK(1),'-2+3,", line)
+
+    async def test_export_streams_under_asgi(self):
+        await sync_to_async(self.add_appointments)(3)
+        token = await sync_to_async(ClinicTokenObtainPairSerializer.get_token)(
+            self.patient_user
+        )
+
+        with mock.patch.object(AppointmentExportView, "CHUNK_SIZE", 2):
+            response = await self.async_client.get(
+                "/api/appointments/export/",
+                headers={"Authorization": f"Bearer {token.access_token}"},
+            )
+            self.assertTrue(response.is_async)
+            chunks = [chunk async for chunk in response.streaming_content]
+
+        # Header plus three rows, two lines per chunk
+        self.assertEqual(len(chunks), 2)
+        self.assertEqual(len(b"".join(chunks).decode().splitlines()), 4)
+
+
+class ConditionalGetTests(ClinicTestCase):
+    def setUp(self):
+        super().setUp()
+        self.add_appointments(3)
+        self.client = self.token_client(self.patient_user)
+
+    def assertChangesETag(self, url, write):
+        etag = self.client.get(url)["ETag"]
+        self.assertEqual(
+            self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304
+        )
+        write()
+        self.assertEqual(
+            self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200
+        )
+
+    def test_unchanged_appointment_list_is_not_modified(self):
+        etag = self.client.get("/api/appointments/")["ETag"]
+
+        # Token principal plus the shared version row: one primary key lookup
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/appointments/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_appointment_writes_change_the_etag(self):
+        appointment = Appointment.objects.first()
+        writes = [
+            lambda: book_slot(self.patient, self.schedule),
+            lambda: Appointment.objects.filter(id=appointment.id).first().save(),
+            lambda: cancel_appointment(appointment),
+            lambda: self.doctor_user.save(),
+            lambda: appointment.schedule.save(),
+            lambda: generate_slots(
+                self.doctor,
+                datetime.date(2032, 1, 1),
+                datetime.date(2032, 1, 1),
+                weekdays=[datetime.date(2032, 1, 1).weekday()],
+                day_start=datetime.time(9, 0),
+                day_end=datetime.time(10, 0),
+                slot_minutes=30,
+            ),
+        ]
+        for write in writes:
+            with self.subTest(write=write):
+                self.assertChangesETag("/api/appointments/", write)
+
+    def test_notification_list(self):
+        book_slot(self.patient, self.schedule)
+        url = "/api/notifications/"
+        etag = self.client.get(url)["ETag"]
+
+        # One aggregate decides, before the page is listed or serialized
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.assertChangesETag(
+            url,
+            lambda: self.client.post(
+                "/api/notifications/mark-read/", {"up_to": 10**6}, format="json"
+            ),
+        )
+
+
+class DoctorSearchTests(ClinicTestCase):
+    def setUp(self):
+        super().setUp()
+        user = CustomUser.objects.create_user(
+            email="cardio@example.com",
+            password=None,
+            first_name="Lisa",
+            last_name="Cuddy",
+            role="DOCTOR",
+        )
+        Doctor.objects.create(user=user, specialty="Cardiología", license_number="L-2")
+
+    def search(self, **params):
+        response = self.client.get("/api/doctors/search/", params)
+        return [d["name"].split()[-1] for d in response.json()["results"]]
+
+    def test_prefix_matching_on_name_and_specialty(self):
+        self.assertEqual(self.search(q="card"), ["Cuddy"])
+        self.assertEqual(self.search(q="gre hou"), ["House"])
+        self.assertEqual(self.search(specialty="diag"), ["House"])
+        self.assertEqual(self.search(q="lisa", specialty="diag"), [])
+        self.assertEqual(self.search(), ["Cuddy", "House"])
+
+    def test_fuzzy_fallback(self):
+        self.assertEqual(self.search(q="cardiolgia"), ["Cuddy"])
+        self.assertEqual(self.search(q="xyz"), [])
+
+    def test_index_follows_profile_edits(self):
+        self.doctor_user.last_name = "Wilson"
+        self.doctor_user.save()
+        self.assertEqual(self.search(q="wils"), ["Wilson"])
+
+    def test_by_specialty_uses_the_index(self):
+        for specialty, expected in (("diag", ["House"]), ("cardiolgia", ["Cuddy"])):
+            with self.subTest(specialty=specialty):
+                response = self.client.get(
+                    "/api/doctors/by-specialty/", {"specialty": specialty}
+                )
+                self.assertEqual(
+                    [d["user"]["last_name"] for d in response.json()], expected
+                )
+        response = self.client.get("/api/doctors/by-specialty/")
+        self.assertEqual(len(response.json()), 2)
+
+    def test_specialty_facets_are_cached(self):
+        response = self.client.get("/api/doctors/specialties/")
+        self.assertEqual(
+            response.json(),
+            [
+                {"specialty": "Cardiología", "count": 1},
+                {"specialty": "Diagnostics", "count": 1},
+            ],
+        )
+        with self.assertNumQueries(0):
+            self.client.get("/api/doctors/specialties/")
+
+
+class DoctorSerializerTests(ClinicTestCase):
+    def test_detail_exposes_only_public_user_fields(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(f"/api/doctors/{self.doctor.id}/")
+
+        self.assertEqual(
+            response.json()["user"],
+            {
+                "id": self.doctor_user.id,
+                "email": "doctor@example.com",
+                "first_name": "Gregory",
+                "last_name": "House",
+            },
+        )
+
+    def test_search_uses_summary_representation(self):
+        with self.assertNumQueries(3):
+            response = self.client.get("/api/doctors/search/", {"q": "house"})
+
+        self.assertEqual(
+            response.json()["results"],
+            [{"id": self.doctor.id, "name": "Gregory House", "specialty": "Diagnostics"}],
+        )
+
+
+class FastJSONTests(ClinicTestCase):
+    def test_renders_like_stock_renderer(self):
+        self.add_appointments(3)
+        Notification.objects.create(
+            user=self.patient_user,
+            message="Line\u2028separated é",
+            notification_type="APPOINTMENT_BOOKED",
+        )
+        client = self.token_client(self.patient_user)
+
+        for url in ("/api/appointments/", "/api/notifications/"):
+            with self.subTest(url=url):
+                data = client.get(url).data
+                self.assertEqual(
+                    FastJSONRenderer().render(data), JSONRenderer().render(data)
+                )
+
+    def test_native_types(self):
+        data = {
+            "date": datetime.date(2030, 1, 1),
+            "time": datetime.time(9, 15),
+            "datetime": datetime.datetime(2030, 1, 1, 9, 15, tzinfo=datetime.timezone.utc),
+            "uuid": uuid.UUID(int=1),
+            "decimal": decimal.Decimal("12.50"),
+            1: "non-string key",
+        }
+        self.assertEqual(
+            json.loads(FastJSONRenderer().render(data)),
+            json.loads(JSONRenderer().render(data)),
+        )
+
+    def test_parser_rejects_malformed_json(self):
+        self.assertEqual(
+            FastJSONParser().parse(io.BytesIO(b'{"ids": [1, 2]}')), {"ids": [1, 2]}
+        )
+        with self.assertRaisesMessage(ParseError, "JSON parse error"):
+            FastJSONParser().parse(io.BytesIO(b'{"ids": [1,'))
+
+        response = self.token_client(self.patient_user).post(
+            "/api/notifications/mark-read/", "{", content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_falls_back_without_orjson(self):
+        data = {"date": datetime.date(2030, 1, 1)}
+        with mock.patch.object(fastjson, "orjson", None):
+            self.assertEqual(
+                FastJSONRenderer().render(data), JSONRenderer().render(data)
+            )
+            self.assertEqual(FastJSONParser().parse(io.BytesIO(b"[1]")), [1])
+
+
+class CompiledSerializerTests(ClinicTestCase):
+    def assertSameRendering(self, serializer_class, queryset):
+        expected = JSONRenderer().render(serializer_class(queryset, many=True).data)
+        rows = serializer_class.read_rows(queryset)
+        self.assertEqual(
+            JSONRenderer().render(serializer_class(rows, many=True).data), expected
+        )
+
+    def add_notifications(self):
+        self.add_appointments(2)
+        for appointment in [None, *Appointment.objects.all()]:
+            Notification.objects.create(
+                user=self.patient_user,
+                message="Appointment booked — été",
+                notification_type="APPOINTMENT_CANCELLED",
+                appointment=appointment,
+                is_read=appointment is None,
+            )
+
+    def test_schedule_rows_render_like_instances(self):
+        self.add_appointments(3)
+        Schedule.objects.create(
+            doctor=self.doctor,
+            date=datetime.date(2030, 2, 28),
+            start_time=datetime.time(23, 45, 30),
+            end_time=datetime.time(23, 59, 59),
+        )
+        self.assertSameRendering(ScheduleSerializer, Schedule.objects.order_by("id"))
+
+    def test_notification_rows_render_like_instances(self):
+        self.add_notifications()
+        Notification.objects.filter(appointment=None).update(
+            created_at=datetime.datetime(
+                2030, 1, 1, 12, 0, 0, 123456, tzinfo=datetime.timezone.utc
+            )
+        )
+        queryset = Notification.objects.order_by("id")
+        for zone in ("UTC", "America/Bogota"):
+            with self.subTest(zone=zone), timezone.override(zone):
+                self.assertSameRendering(NotificationSerializer, queryset)
+
+    def test_list_endpoints_render_like_instances(self):
+        self.add_notifications()
+        client = self.token_client(self.patient_user)
+        response = client.get("/api/notifications/?page_size=2")
+        expected = NotificationSerializer(
+            Notification.objects.order_by("-created_at", "-id")[:2], many=True
+        ).data
+        self.assertEqual(response.json()["results"], json.loads(json.dumps(expected)))
+
+        response = self.token_client(self.doctor_user).get("/api/schedules/")
+        expected = ScheduleSerializer(
+            Schedule.objects.filter(doctor=self.doctor), many=True
+        ).data
+        self.assertEqual(response.json(), json.loads(json.dumps(expected)))
+
+    def test_rejects_fields_without_a_column(self):
+        class NamedScheduleSerializer(CompiledReadMixin, serializers.ModelSerializer):
+            label = serializers.SerializerMethodField()
+
+            class Meta:
+                model = Schedule
+                fields = ["id", "label"]
+
+        with self.assertRaises(ImproperlyConfigured):
+            NamedScheduleSerializer.compiled()
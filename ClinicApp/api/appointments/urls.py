@@ -1,10 +1,16 @@
 from django.urls import path
 from .views import (
     ScheduleCreateView,
+    ScheduleGenerateView,
     DoctorAvailabilityView,
+    AvailabilitySearchView,
+    AvailabilityCacheStatsView,
     AppointmentCreateView,
     DoctorsBySpecialtyView,
+    DoctorSearchView,
+    SpecialtyListView,
     AppointmentListView,
+    AppointmentExportView,
     AppointmentUpdateView,
     DoctorDetailView,
     DoctorByUserView,
@@ -12,17 +18,36 @@ from .views import (
     ScheduleDeleteView,
     CurrentDoctorView,
     NotificationListView,
+    NotificationStreamView,
+    NotificationStreamTicketView,
+    NotificationUnreadCountView,
+    NotificationMarkReadView,
     NotificationUpdateView,
 )
 
 
 urlpatterns = [
     path("schedules/", ScheduleCreateView.as_view(), name="schedule-list"),
+    path(
+        "schedules/generate/",
+        ScheduleGenerateView.as_view(),
+        name="schedule-generate",
+    ),
     path(
         "doctors/availability/<int:doctor_id>/",
         DoctorAvailabilityView.as_view(),
         name="doctor-availability",
     ),
+    path(
+        "doctors/availability/search/",
+        AvailabilitySearchView.as_view(),
+        name="availability-search",
+    ),
+    path(
+        "doctors/availability/cache-stats/",
+        AvailabilityCacheStatsView.as_view(),
+        name="availability-cache-stats",
+    ),
     path(
         "appointments/create/",
         AppointmentCreateView.as_view(),
@@ -33,7 +58,14 @@ urlpatterns = [
         DoctorsBySpecialtyView.as_view(),
         name="doctors-by-specialty",
     ),
+    path("doctors/search/", DoctorSearchView.as_view(), name="doctor-search"),
+    path("doctors/specialties/", SpecialtyListView.as_view(), name="specialties"),
     path("appointments/", AppointmentListView.as_view(), name="appointment-list"),
+    path(
+        "appointments/export/",
+        AppointmentExportView.as_view(),
+        name="appointment-export",
+    ),
     path(
         "appointments/<int:pk>/",
         AppointmentUpdateView.as_view(),
@@ -45,6 +77,26 @@ urlpatterns = [
     path("schedules/<int:pk>/", ScheduleDeleteView.as_view(), name="schedule-delete"),
     path("doctors/me/", CurrentDoctorView.as_view(), name="current-doctor"),
     path("notifications/", NotificationListView.as_view(), name="notification-list"),
+    path(
+        "notifications/unread-count/",
+        NotificationUnreadCountView.as_view(),
+        name="notification-unread-count",
+    ),
+    path(
+        "notifications/mark-read/",
+        NotificationMarkReadView.as_view(),
+        name="notification-mark-read",
+    ),
+    path(
+        "notifications/stream/",
+        NotificationStreamView.as_view(),
+        name="notification-stream",
+    ),
+    path(
+        "notifications/stream/ticket/",
+        NotificationStreamTicketView.as_view(),
+        name="notification-stream-ticket",
+    ),
     path(
         "notifications/<int:pk>/",
         NotificationUpdateView.as_view(),
@@ -1,45 +1,146 @@
+import asyncio
+import csv
+import json
+import time
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.views import View
 from rest_framework import generics, permissions, status
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
 from rest_framework.exceptions import ValidationError
 from django.utils import timezone
 from django.db.models import Q
 from .models import Doctor, Schedule, Appointment, Patient, Notification
+from .booking import book_slot, cancel_appointment, SlotUnavailable
+from .slots import generate_slots
+from .notifications import (
+    STREAM_TICKET_SECONDS,
+    broker,
+    enqueue,
+    issue_stream_ticket,
+    read_stream_ticket,
+)
+from .availability import (
+    search_availability,
+    get_day_availability,
+    invalidate_availability,
+    availability_cache_stats,
+)
 from .serializers import (
     DoctorSerializer,
+    DoctorSummarySerializer,
     ScheduleSerializer,
+    ScheduleTemplateSerializer,
     AppointmentSerializer,
+    AppointmentListSerializer,
     NotificationSerializer,
+    NotificationMarkReadSerializer,
 )
+from users.authentication import TokenPrincipalAuthentication, load_profile_ids
 from users.models import CustomUser
 from rest_framework.permissions import IsAuthenticated
 from django.shortcuts import get_object_or_404
-from django.utils.dateparse import parse_date
+from django.utils.dateparse import parse_date, parse_datetime
+from .pagination import (
+    NotificationCursorPagination,
+    AppointmentKeysetPagination,
+    DoctorSearchPagination,
+)
+from .search import search_doctors, specialty_facets
+from .etags import appointments_version, notifications_version
+from core.compiled import CompiledListMixin
+from core.conditional import ConditionalGetMixin
+
+
+# For views that only need the caller's id, role and profile ids
+PRINCIPAL_AUTHENTICATION = [TokenPrincipalAuthentication, SessionAuthentication]
+
+
+def current_doctor_id(user):
+    # Served from the cached authenticated user, no query on the common path
+    doctor_id = load_profile_ids(user).doctor_id
+    if doctor_id is None:
+        raise ValidationError("Doctor profile not found")
+    return doctor_id
 
 
 # View for doctors to define their schedules
-class ScheduleCreateView(generics.ListCreateAPIView):
+class ScheduleCreateView(CompiledListMixin, generics.ListCreateAPIView):
     serializer_class = ScheduleSerializer
     permission_classes = [permissions.IsAuthenticated]
 
+    def get_authenticators(self):
+        # The token principal is enough to list schedules; creating one loads the
+        # user, so a deactivated or deleted doctor is turned away
+        if self.request.method in permissions.SAFE_METHODS:
+            return [auth() for auth in PRINCIPAL_AUTHENTICATION]
+        return super().get_authenticators()
+
     def get_queryset(self):
         # Doctors only see their schedules
         if self.request.user.role == "DOCTOR":
-            doctor = Doctor.objects.get(user=self.request.user)
-            return Schedule.objects.filter(doctor=doctor)
+            return Schedule.objects.filter(
+                doctor_id=current_doctor_id(self.request.user)
+            )
         # Admin sees all schedules
         return Schedule.objects.all()
 
     def perform_create(self, serializer):
         # For doctors, automatically assign your profile
         if self.request.user.role == "DOCTOR":
-            doctor = Doctor.objects.get(user=self.request.user)
-            serializer.save(doctor=doctor, is_available=True)
+            schedule = serializer.save(
+                doctor_id=current_doctor_id(self.request.user), is_available=True
+            )
         else:
             # For admin, requires Doctors in data
             if "doctor" not in serializer.validated_data:
                 raise ValidationError("Doctor is required for admin users")
-            serializer.save(is_available=True)
+            schedule = serializer.save(is_available=True)
+        invalidate_availability(schedule.doctor_id, schedule.date)
+
+
+# View for doctors to fill a date range from a weekly template in one request
+class ScheduleGenerateView(generics.GenericAPIView):
+    serializer_class = ScheduleTemplateSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        if request.user.role == "DOCTOR":
+            doctor = Doctor(id=current_doctor_id(request.user))
+        elif request.user.role == "ADMIN":
+            # For admin, requires Doctors in data
+            if "doctor" not in data:
+                raise ValidationError("Doctor is required for admin users")
+            doctor = data["doctor"]
+        else:
+            return Response(
+                {"detail": "Only doctors and admins can create schedules"},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        result = generate_slots(
+            doctor,
+            data["start_date"],
+            data["end_date"],
+            weekdays=set(data["weekdays"]),
+            day_start=data["day_start"],
+            day_end=data["day_end"],
+            slot_minutes=data["slot_minutes"],
+            breaks=[(b["start"], b["end"]) for b in data["breaks"]],
+        )
+        return Response(result, status=status.HTTP_201_CREATED)
 
 
 # View for doctor availability
@@ -47,14 +148,83 @@ class DoctorAvailabilityView(APIView):
     permission_classes = [permissions.AllowAny]
 
     def get(self, request, doctor_id):
-        date = request.query_params.get("date", timezone.now().date())
+        date_str = request.query_params.get("date")
+        try:
+            date = parse_date(date_str) if date_str else timezone.now().date()
+        except ValueError:
+            # Well-formed but impossible, e.g. 2030-02-30
+            date = None
+        if date is None:
+            return Response(
+                {"detail": "Invalid date"}, status=status.HTTP_400_BAD_REQUEST
+            )
 
-        schedules = Schedule.objects.filter(
-            doctor_id=doctor_id, date=date, is_available=True
-        ).order_by("start_time")
+        return Response(get_day_availability(doctor_id, date))
 
-        serializer = ScheduleSerializer(schedules, many=True)
-        return Response(serializer.data)
+
+# View for admins to monitor the availability cache
+class AvailabilityCacheStatsView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        if request.user.role != "ADMIN":
+            return Response(
+                {"detail": "Only admins can view cache statistics"},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+        return Response(availability_cache_stats())
+
+
+def parse_date_param(params, name):
+    # None when absent; malformed and impossible dates (2030-02-30) are a 400
+    if not params.get(name):
+        return None
+    try:
+        date = parse_date(params[name])
+    except ValueError:
+        date = None
+    if date is None:
+        raise ValidationError({name: "Invalid date"})
+    return date
+
+
+# View to search free slots across doctors and dates in one request
+class AvailabilitySearchView(APIView):
+    permission_classes = [permissions.AllowAny]
+    MAX_DAYS = 31
+
+    def get(self, request):
+        today = timezone.now().date()
+        start_date = parse_date_param(request.query_params, "start_date") or today
+        end_date = parse_date_param(request.query_params, "end_date") or start_date
+        if start_date > end_date:
+            return Response(
+                {"detail": "start_date must be before end_date"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if (end_date - start_date).days >= self.MAX_DAYS:
+            return Response(
+                {"detail": f"Date range cannot exceed {self.MAX_DAYS} days"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        doctor_ids = request.query_params.get("doctors", "")
+        try:
+            doctor_ids = [int(pk) for pk in doctor_ids.split(",") if pk.strip()]
+        except ValueError:
+            return Response(
+                {"detail": "doctors must be a comma-separated list of ids"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        return Response(
+            search_availability(
+                start_date,
+                end_date,
+                specialty=request.query_params.get("specialty"),
+                doctor_ids=doctor_ids,
+            )
+        )
 
 
 # View to create appointments
@@ -71,7 +241,9 @@ class AppointmentCreateView(generics.CreateAPIView):
             )
 
         try:
-            schedule = Schedule.objects.get(id=schedule_id)
+            schedule = Schedule.objects.select_related("doctor__user").get(
+                id=schedule_id
+            )
         except Schedule.DoesNotExist:
             return Response(
                 {"detail": "Schedule not found"}, status=status.HTTP_404_NOT_FOUND
@@ -91,31 +263,10 @@ class AppointmentCreateView(generics.CreateAPIView):
 
         patient, created = Patient.objects.get_or_create(user=request.user)
 
-        if created:
-            pass
-
-        appointment = Appointment.objects.create(
-            patient=patient, schedule=schedule, status="PENDING"
-        )
-
-        # Create notification for patient
-        Notification.objects.create(
-            user=request.user,
-            message=f"Your appointment with Dr. {appointment.schedule.doctor.user.first_name} {appointment.schedule.doctor.user.last_name} on {schedule.date} at {schedule.start_time} has been booked.",
-            notification_type="APPOINTMENT_BOOKED",
-            appointment=appointment,
-        )
-
-        # Create notification for doctor
-        Notification.objects.create(
-            user=schedule.doctor.user,
-            message=f"New appointment booked by {appointment.patient.user.first_name} {appointment.patient.user.last_name} on {schedule.date} at {schedule.start_time}.",
-            notification_type="APPOINTMENT_BOOKED",
-            appointment=appointment,
-        )
-
-        schedule.is_available = False
-        schedule.save()
+        try:
+            appointment = book_slot(patient, schedule)
+        except SlotUnavailable as e:
+            return Response({"detail": str(e)}, status=status.HTTP_409_CONFLICT)
 
         serializer = self.get_serializer(appointment)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
@@ -126,52 +277,184 @@ class DoctorsBySpecialtyView(APIView):
     permission_classes = [permissions.AllowAny]
 
     def get(self, request):
-        specialty = request.query_params.get("specialty", "")
-        doctors = Doctor.objects.filter(specialty__icontains=specialty)
+        # The search term index instead of an icontains scan over every doctor
+        doctors = search_doctors(specialty=request.query_params.get("specialty", ""))
         serializer = DoctorSerializer(doctors, many=True)
         return Response(serializer.data)
 
 
+# Prefix and typo-tolerant search over doctor names and specialties
+class DoctorSearchView(generics.ListAPIView):
+    serializer_class = DoctorSummarySerializer
+    permission_classes = [permissions.AllowAny]
+    pagination_class = DoctorSearchPagination
+
+    def get_queryset(self):
+        return DoctorSummarySerializer.setup_eager_loading(
+            search_doctors(
+                self.request.query_params.get("q", ""),
+                self.request.query_params.get("specialty", ""),
+            )
+        )
+
+
+class SpecialtyListView(APIView):
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request):
+        return Response(specialty_facets())
+
+
+def filter_appointments(queryset, user, params):
+    # Role scoping plus the query-string filters shared by list and export
+    load_profile_ids(user)
+    if user.role == "PATIENT":
+        queryset = queryset.filter(patient_id=user.patient_id)
+    elif user.role == "DOCTOR":
+        queryset = queryset.filter(schedule__doctor_id=user.doctor_id)
+    elif user.role == "ADMIN":
+        pass
+    else:
+        return queryset.none()
+
+    # ?date= is kept for the doctor dashboard; ?start_date/?end_date bound a range
+    filters = {
+        "schedule__date": "date",
+        "schedule__date__gte": "start_date",
+        "schedule__date__lte": "end_date",
+    }
+    for lookup, param in filters.items():
+        date = parse_date_param(params, param)
+        if date is not None:
+            queryset = queryset.filter(**{lookup: date})
+
+    if params.get("status"):
+        statuses = params["status"].upper().split(",")
+        valid = {choice for choice, _ in Appointment.STATUS_CHOICES}
+        if not set(statuses) <= valid:
+            raise ValidationError({"status": "Invalid status"})
+        queryset = queryset.filter(status__in=statuses)
+
+    if params.get("doctor"):
+        try:
+            queryset = queryset.filter(schedule__doctor_id=int(params["doctor"]))
+        except ValueError:
+            raise ValidationError({"doctor": "Invalid doctor id"})
+
+    return queryset
+
+
 # Appointment management view (patients/doctors)
-class AppointmentListView(generics.ListAPIView):
-    serializer_class = AppointmentSerializer
+class AppointmentListView(ConditionalGetMixin, generics.ListAPIView):
+    serializer_class = AppointmentListSerializer
+    authentication_classes = PRINCIPAL_AUTHENTICATION
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = AppointmentKeysetPagination
 
     def get_queryset(self):
-        user = self.request.user
+        # One joined, projected query per page
+        queryset = AppointmentListSerializer.setup_eager_loading(
+            Appointment.objects.all()
+        )
+        return filter_appointments(
+            queryset, self.request.user, self.request.query_params
+        )
+
+    def get_etag_validator(self):
+        return appointments_version()
+
+
+class _Echo:
+    # File-like object for csv.writer that hands each row straight back
+    def write(self, value):
+        return value
+
+
+def _read_in_batches(lines, size):
+    # Under ASGI Django buffers a sync iterator in full before sending it; an
+    # async one is streamed, so the lines are read in batches in the sync thread
+    async def batches():
+        iterator = iter(lines)
+        read = sync_to_async(lambda: "".join(islice(iterator, size)))
+        while chunk := await read():
+            yield chunk
+
+    return batches()
+
+
+# Streaming export for reports; memory stays flat regardless of row count
+class AppointmentExportView(APIView):
+    authentication_classes = PRINCIPAL_AUTHENTICATION
+    permission_classes = [permissions.IsAuthenticated]
+    CHUNK_SIZE = 2000
+    # Spreadsheets evaluate cells starting with these as formulas
+    FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+    COLUMNS = {
+        "id": "id",
+        "date": "schedule__date",
+        "start_time": "schedule__start_time",
+        "end_time": "schedule__end_time",
+        "status": "status",
+        "created_at": "created_at",
+        "doctor_id": "schedule__doctor_id",
+        "doctor_first_name": "schedule__doctor__user__first_name",
+        "doctor_last_name": "schedule__doctor__user__last_name",
+        "specialty": "schedule__doctor__specialty",
+        "patient_id": "patient_id",
+        "patient_first_name": "patient__user__first_name",
+        "patient_last_name": "patient__user__last_name",
+        "patient_email": "patient__user__email",
+    }
+
+    def get(self, request):
+        # ?output= rather than ?format=, which DRF reserves for renderer selection
+        output = request.query_params.get("output", "csv")
+        if output not in ("csv", "ndjson"):
+            return Response(
+                {"detail": "output must be csv or ndjson"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-        # Optimize queries with select_related
-        queryset = Appointment.objects.select_related(
-            "patient__user", "schedule__doctor__user"
+        queryset = filter_appointments(
+            Appointment.objects.all(), request.user, request.query_params
+        )
+        rows = (
+            queryset.order_by("schedule__date", "schedule__start_time", "id")
+            .values_list(*self.COLUMNS.values())
+            .iterator(chunk_size=self.CHUNK_SIZE)
         )
 
-        if user.role == "PATIENT":
-            patient = Patient.objects.filter(user=user).first()
-            if patient:
-                queryset = queryset.filter(patient=patient)
-            else:
-                queryset = queryset.none()
-
-        elif user.role == "DOCTOR":
-            doctor = Doctor.objects.filter(user=user).first()
-            if doctor:
-                queryset = queryset.filter(schedule__doctor=doctor)
-            else:
-                queryset = queryset.none()
-
-            date_str = self.request.query_params.get("date")
-            if date_str:
-                date = parse_date(date_str)
-                if date:
-                    queryset = queryset.filter(schedule__date=date)
-
-        elif user.role == "ADMIN":
-            queryset
-            pass
+        if output == "csv":
+            content, content_type = self.csv_lines(rows), "text/csv"
         else:
-            queryset = queryset.none()
+            content, content_type = self.ndjson_lines(rows), "application/x-ndjson"
 
-        return queryset
+        if isinstance(request._request, ASGIRequest):
+            content = _read_in_batches(content, self.CHUNK_SIZE)
+        response = StreamingHttpResponse(content, content_type=content_type)
+        response["Content-Disposition"] = (
+            f'attachment; filename="appointments.{output}"'
+        )
+        return response
+
+    def csv_lines(self, rows):
+        writer = csv.writer(_Echo())
+        yield writer.writerow(self.COLUMNS.keys())
+        for row in rows:
+            yield writer.writerow(self.csv_cell(value) for value in row)
+
+    def csv_cell(self, value):
+        if hasattr(value, "isoformat"):
+            return value.isoformat()
+        # Names come from users; quote anything a spreadsheet would run
+        if isinstance(value, str) and value.startswith(self.FORMULA_PREFIXES):
+            return "'" + value
+        return value
+
+    def ndjson_lines(self, rows):
+        names = list(self.COLUMNS)
+        for row in rows:
+            yield json.dumps(dict(zip(names, row)), cls=DjangoJSONEncoder) + "\n"
 
 
 # View to update appointment status
@@ -191,30 +474,17 @@ class AppointmentUpdateView(generics.UpdateAPIView):
         old_status = appointment.status
         new_status = serializer.validated_data.get("status", appointment.status)
 
+        # A cancelled appointment has released its slot, which may already be
+        # booked again; it cannot come back, the patient books a new one
+        if old_status == "CANCELLED" and new_status != "CANCELLED":
+            raise ValidationError(
+                {"status": "Cancelled appointments cannot be reopened"}
+            )
+
         # Handle state changes
         if new_status == "CANCELLED":
             # Free up your schedule when an appointment is canceled
-            schedule = appointment.schedule
-            schedule.is_available = True
-            schedule.save()
-
-            # Update status only
-            appointment.status = "CANCELLED"
-            appointment.save()
-
-            # Create notifications for cancellation
-            Notification.objects.create(
-                user=appointment.patient.user,
-                message=f"Your appointment with Dr. {appointment.schedule.doctor.user.first_name} {appointment.schedule.doctor.user.last_name} on {appointment.schedule.date} at {appointment.schedule.start_time} has been cancelled.",
-                notification_type="APPOINTMENT_CANCELLED",
-                appointment=appointment,
-            )
-            Notification.objects.create(
-                user=appointment.schedule.doctor.user,
-                message=f"Appointment with {appointment.patient.user.first_name} {appointment.patient.user.last_name} on {appointment.schedule.date} at {appointment.schedule.start_time} has been cancelled.",
-                notification_type="APPOINTMENT_CANCELLED",
-                appointment=appointment,
-            )
+            cancel_appointment(appointment)
             return
 
         elif new_status == "CONFIRMED" and old_status != "CONFIRMED":
@@ -222,12 +492,7 @@ class AppointmentUpdateView(generics.UpdateAPIView):
             serializer.save()
 
             # Create notification for confirmation
-            Notification.objects.create(
-                user=appointment.patient.user,
-                message=f"Your appointment with Dr. {appointment.schedule.doctor.user.first_name} {appointment.schedule.doctor.user.last_name} on {appointment.schedule.date} at {appointment.schedule.start_time} has been confirmed.",
-                notification_type="APPOINTMENT_CONFIRMED",
-                appointment=appointment,
-            )
+            enqueue(appointment, "APPOINTMENT_CONFIRMED")
 
         else:
             # For other status changes, just save
@@ -237,7 +502,7 @@ class AppointmentUpdateView(generics.UpdateAPIView):
 
 
 class DoctorDetailView(generics.RetrieveDestroyAPIView):
-    queryset = Doctor.objects.all()
+    queryset = Doctor.objects.select_related("user")
     serializer_class = DoctorSerializer
     permission_classes = [permissions.AllowAny]
 
@@ -259,7 +524,7 @@ class DoctorByUserView(generics.RetrieveAPIView):
             )
 
         try:
-            doctor = Doctor.objects.get(user_id=user_id)
+            doctor = Doctor.objects.select_related("user").get(user_id=user_id)
             serializer = DoctorSerializer(doctor)
             return Response(serializer.data)
         except Doctor.DoesNotExist:
@@ -300,25 +565,170 @@ class ScheduleDeleteView(generics.DestroyAPIView):
 
     def get_queryset(self):
         if self.request.user.role == "DOCTOR":
-            doctor = Doctor.objects.get(user=self.request.user)
-            return Schedule.objects.filter(doctor=doctor)
+            return Schedule.objects.filter(
+                doctor_id=current_doctor_id(self.request.user)
+            )
         return Schedule.objects.all()
 
+    def perform_destroy(self, instance):
+        invalidate_availability(instance.doctor_id, instance.date)
+        instance.delete()
+
 
 class CurrentDoctorView(generics.RetrieveAPIView):
     serializer_class = DoctorSerializer
     permission_classes = [IsAuthenticated]
 
     def get_object(self):
-        return Doctor.objects.get(user=self.request.user)
+        return Doctor.objects.select_related("user").get(user=self.request.user)
 
 
-class NotificationListView(generics.ListAPIView):
+class NotificationListView(
+    ConditionalGetMixin, CompiledListMixin, generics.ListAPIView
+):
     serializer_class = NotificationSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = NotificationCursorPagination
 
     def get_queryset(self):
-        return Notification.objects.filter(user=self.request.user)
+        queryset = Notification.objects.filter(user=self.request.user)
+
+        # Incremental fetch: only notifications newer than ?since=<ISO datetime>
+        since_str = self.request.query_params.get("since")
+        if since_str:
+            since = parse_datetime(since_str)
+            if since is None:
+                raise ValidationError({"since": "Invalid datetime"})
+            queryset = queryset.filter(created_at__gt=since)
+
+        return queryset
+
+    def get_etag_validator(self):
+        return notifications_version(self.request.user)
+
+
+class NotificationUnreadCountView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        unread = Notification.objects.filter(user=request.user, is_read=False)
+        return Response({"unread_count": unread.count()})
+
+
+# Server-sent events stream of new notifications; needs an ASGI server (core.asgi)
+class NotificationStreamTicketView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        # No stream without ASGI (see NotificationStreamView): tell the client to poll
+        if not isinstance(request._request, ASGIRequest):
+            return Response(status=status.HTTP_204_NO_CONTENT)
+
+        # The stream lasts no longer than the access token it was requested with
+        if request.auth is not None:
+            expires_at = request.auth["exp"]
+        else:
+            expires_at = int(
+                time.time() + jwt_settings.ACCESS_TOKEN_LIFETIME.total_seconds()
+            )
+        return Response(
+            {
+                "ticket": issue_stream_ticket(request.user.id, expires_at),
+                "expires_in": STREAM_TICKET_SECONDS,
+            }
+        )
+
+
+class NotificationStreamView(View):
+    HEARTBEAT_SECONDS = 15
+
+    async def get(self, request):
+        # A WSGI worker (runserver) would be held by the stream for as long as
+        # the client stays connected; answer No Content so the client polls
+        if not isinstance(request, ASGIRequest):
+            return HttpResponse(status=status.HTTP_204_NO_CONTENT)
+
+        ticket = await sync_to_async(self.authenticate)(request)
+        if ticket is None:
+            return JsonResponse(
+                {"detail": "Invalid or expired stream ticket."},
+                status=status.HTTP_401_UNAUTHORIZED,
+            )
+        user_id, expires_at = ticket
+
+        # EventSource sends Last-Event-ID when it reconnects
+        last_id = request.headers.get("Last-Event-ID") or request.GET.get("last_id")
+        try:
+            last_id = int(last_id) if last_id else None
+        except ValueError:
+            return JsonResponse(
+                {"detail": "Invalid last event id"}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        response = StreamingHttpResponse(
+            self.events(user_id, last_id, expires_at), content_type="text/event-stream"
+        )
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    def authenticate(self, request):
+        # EventSource cannot set headers, so it presents a ticket from
+        # NotificationStreamTicketView rather than the access token
+        ticket = read_stream_ticket(request.GET.get("ticket", ""))
+        if ticket is None:
+            return None
+        user_id, expires_at = ticket
+        if expires_at <= time.time():
+            return None
+        if not CustomUser.objects.filter(pk=user_id, is_active=True).exists():
+            return None
+        return ticket
+
+    def backlog(self, user_id, last_id):
+        notifications = Notification.objects.filter(
+            user_id=user_id, id__gt=last_id
+        ).order_by("id")
+        return NotificationSerializer(
+            NotificationSerializer.read_rows(notifications), many=True
+        ).data
+
+    async def events(self, user_id, last_id, expires_at):
+        # Subscribe before replaying so nothing created in between is lost
+        subscription = broker.subscribe(user_id)
+        try:
+            if last_id is not None:
+                for payload in await sync_to_async(self.backlog)(user_id, last_id):
+                    last_id = payload["id"]
+                    yield self.format_event(payload)
+            last_id = last_id or 0
+
+            queue = subscription[1]
+            while True:
+                remaining = expires_at - time.time()
+                if remaining <= 0:
+                    # The access token behind the ticket has expired; the client
+                    # comes back with a new ticket
+                    return
+                try:
+                    payload = await asyncio.wait_for(
+                        queue.get(), min(self.HEARTBEAT_SECONDS, remaining)
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if payload is None:
+                    return
+                if payload["id"] <= last_id:
+                    continue
+                last_id = payload["id"]
+                yield self.format_event(payload)
+        finally:
+            broker.unsubscribe(user_id, subscription)
+
+    @staticmethod
+    def format_event(payload):
+        return f"id: {payload['id']}\nevent: notification\ndata: {json.dumps(payload)}\n\n"
 
 
 class NotificationUpdateView(generics.UpdateAPIView):
@@ -329,5 +739,23 @@ class NotificationUpdateView(generics.UpdateAPIView):
     def update(self, request, *args, **kwargs):
         instance = self.get_object()
         instance.is_read = True
-        instance.save()
+        instance.save(update_fields=["is_read"])
         return Response(self.get_serializer(instance).data)
+
+
+# Mark many notifications read with a single UPDATE
+class NotificationMarkReadView(generics.GenericAPIView):
+    serializer_class = NotificationMarkReadSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        queryset = Notification.objects.filter(user=request.user, is_read=False)
+        if "ids" in serializer.validated_data:
+            queryset = queryset.filter(id__in=serializer.validated_data["ids"])
+        else:
+            queryset = queryset.filter(id__lte=serializer.validated_data["up_to"])
+
+        return Response({"updated": queryset.update(is_read=True)})
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class CoreConfig(AppConfig):
+    name = "core"
+
+    def ready(self):
+        # Registers the connection_created hook that tunes SQLite connections
+        from . import database  # noqa: F401
@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+# Read by core.settings to turn persistent database connections off
+os.environ.setdefault('DJANGO_ASGI', '1')
 
 application = get_asgi_application()
@@ -0,0 +1,110 @@
+import os
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from django.db import OperationalError, close_old_connections, connection
+
+
+@contextmanager
+def benchmark_database():
+    # Run benchmarks against a throwaway copy of the schema so the development
+    # database is never touched. SQLite gets a file-backed database (instead of the
+    # default in-memory test database) so worker threads open real connections.
+    test_settings = connection.settings_dict.setdefault("TEST", {})
+    old_test_name = test_settings.get("NAME")
+    tmp_dir = None
+    if connection.vendor == "sqlite":
+        tmp_dir = tempfile.mkdtemp(prefix="bench-")
+        test_settings["NAME"] = os.path.join(tmp_dir, "bench.sqlite3")
+
+    old_name = connection.creation.create_test_db(
+        verbosity=0, autoclobber=True, serialize=False
+    )
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        test_settings["NAME"] = old_test_name
+        if tmp_dir:
+            for name in os.listdir(tmp_dir):
+                os.remove(os.path.join(tmp_dir, name))
+            os.rmdir(tmp_dir)
+
+
+class Timer:
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self.start
+
+
+class QueryCounter:
+    # Counts statements on the default connection without the 9000-entry cap
+    # of connection.queries
+    def __enter__(self):
+        self.count = 0
+        self._wrapper = connection.execute_wrapper(self)
+        self._wrapper.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        self._wrapper.__exit__(*exc)
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def database_profile():
+    # The settings the active connection runs with, for benchmark reports
+    settings_dict = connection.settings_dict
+    profile = [connection.vendor, f"CONN_MAX_AGE={settings_dict['CONN_MAX_AGE']}"]
+    if connection.vendor == "sqlite":
+        with connection.cursor() as cursor:
+            for pragma in ("journal_mode", "synchronous", "busy_timeout", "mmap_size"):
+                cursor.execute(f"PRAGMA {pragma}")
+                profile.append(f"{pragma}={cursor.fetchone()[0]}")
+        mode = settings_dict["OPTIONS"].get("transaction_mode") or "DEFERRED"
+        profile.append(f"transaction_mode={mode}")
+    else:
+        profile.append(f"CONN_HEALTH_CHECKS={settings_dict['CONN_HEALTH_CHECKS']}")
+        if "pool" in settings_dict["OPTIONS"]:
+            profile.append(f"pool={settings_dict['OPTIONS']['pool']}")
+    return ", ".join(profile)
+
+
+def run_concurrently(operation, workers, operations):
+    # Calls operation(worker, i) `operations` times from each of `workers` threads.
+    # Connections are released between calls like at the end of a request, so
+    # CONN_MAX_AGE and pooling apply. Returns the elapsed time, the latency of
+    # each successful call and a Counter of database errors by message.
+    latencies, errors = [], Counter()
+    lock = threading.Lock()
+
+    def work(worker):
+        try:
+            for i in range(operations):
+                start = time.perf_counter()
+                try:
+                    operation(worker, i)
+                except OperationalError as exc:
+                    with lock:
+                        errors[str(exc)] += 1
+                else:
+                    with lock:
+                        latencies.append(time.perf_counter() - start)
+                finally:
+                    close_old_connections()
+        finally:
+            connection.close()
+
+    with Timer() as timer:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(work, range(workers)))
+    return timer.elapsed, latencies, errors
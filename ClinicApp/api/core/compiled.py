@@ -0,0 +1,160 @@
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.db import models
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+# Fields whose to_representation() returns database values unchanged, so the
+# compiled function copies them as they are
+PASSTHROUGH = {
+    serializers.BooleanField.to_representation,
+    serializers.CharField.to_representation,
+    serializers.IntegerField.to_representation,
+    serializers.ReadOnlyField.to_representation,
+}
+
+
+def compile_serializer(serializer):
+    # Turn a serializer's readable fields into (columns, to_dicts): columns to pass
+    # to values_list() and a function building, from a list of those rows, the
+    # same dicts serializer.to_representation() builds from instances. Other
+    # fields keep their own to_representation(), so formats are unchanged.
+    model = serializer.Meta.model
+    columns, setup, items, namespace = [], [], [], {}
+    for index, field in enumerate(serializer._readable_fields):
+        column = _column(model, field)
+        if column is None:
+            raise ImproperlyConfigured(
+                f"{type(serializer).__name__}.{field.field_name} cannot be "
+                "read from a values() row"
+            )
+        columns.append(column)
+
+        value = f"row[{index}]"
+        if isinstance(field, serializers.DateTimeField):
+            # The time zone lookup goes through a context-local, so it is done
+            # once per list instead of once per value
+            namespace[f"timezone_{index}"] = _field_timezone(field)
+            namespace[f"convert_{index}"] = _datetime_to_representation(field)
+            setup.append(f"    zone_{index} = timezone_{index}()\n")
+            value = f"None if {value} is None else convert_{index}({value}, zone_{index})"
+        elif type(field).to_representation not in PASSTHROUGH and not (
+            isinstance(field, serializers.PrimaryKeyRelatedField)
+            and field.pk_field is None
+        ):
+            namespace[f"convert_{index}"] = field.to_representation
+            value = f"None if {value} is None else convert_{index}({value})"
+        items.append(f"            {field.field_name!r}: {value},\n")
+
+    source = (
+        "def to_dicts(rows):\n"
+        + "".join(setup)
+        + "    return [\n        {\n"
+        + "".join(items)
+        + "        }\n        for row in rows\n    ]\n"
+    )
+    exec(source, namespace)
+    return columns, namespace["to_dicts"]
+
+
+def _column(model, field):
+    # Only plain model fields and foreign key ids map one-to-one to a column
+    if isinstance(
+        field,
+        (
+            serializers.BaseSerializer,
+            serializers.ManyRelatedField,
+            serializers.SerializerMethodField,
+        ),
+    ) or len(field.source_attrs) != 1:
+        return None
+    if isinstance(field, serializers.RelatedField) and not isinstance(
+        field, serializers.PrimaryKeyRelatedField
+    ):
+        return None
+    try:
+        model_field = model._meta.get_field(field.source)
+    except FieldDoesNotExist:
+        return None
+    if not model_field.concrete or model_field.many_to_many:
+        return None
+    return model_field.name
+
+
+def _field_timezone(field):
+    def field_timezone():
+        if hasattr(field, "timezone"):
+            return field.timezone
+        return field.default_timezone()
+
+    return field_timezone
+
+
+def _datetime_to_representation(field):
+    # DateTimeField.to_representation() for aware values, given the time zone;
+    # anything else is left to the field
+    output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+
+    def to_representation(value, zone):
+        if (
+            output_format is None
+            or zone is None
+            or isinstance(value, str)
+            or not timezone.is_aware(value)
+        ):
+            return field.to_representation(value)
+        try:
+            value = value.astimezone(zone)
+        except OverflowError:
+            return field.to_representation(value)
+        if output_format.lower() == ISO_8601:
+            value = value.isoformat()
+            if value.endswith("+00:00"):
+                value = value[:-6] + "Z"
+            return value
+        return value.strftime(output_format)
+
+    return to_representation
+
+
+class CompiledListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        if isinstance(data, models.manager.BaseManager):
+            data = data.all()
+        rows = list(data)
+        if rows and isinstance(rows[0], tuple):
+            return self.child.compiled()[1](rows)
+        return super().to_representation(rows)
+
+
+class CompiledReadMixin:
+    # Read-only fast path for ModelSerializers; set
+    # Meta.list_serializer_class = CompiledListSerializer alongside it.
+    # read_rows() turns a queryset into values_list() rows, which are converted by
+    # a function compiled once per class instead of walking the fields for every
+    # object. Instances, writes and validation still go through DRF.
+
+    @classmethod
+    def compiled(cls):
+        if "_compiled" not in cls.__dict__:
+            cls._compiled = compile_serializer(cls())
+        return cls._compiled
+
+    @classmethod
+    def read_rows(cls, queryset):
+        # Named rows keep attribute access working for cursor paginators
+        columns, _ = cls.compiled()
+        return queryset.values_list(*columns, named=True)
+
+    def to_representation(self, instance):
+        if isinstance(instance, tuple):
+            return self.compiled()[1]([instance])[0]
+        return super().to_representation(instance)
+
+
+class CompiledListMixin:
+    # For list views whose serializer uses CompiledReadMixin: the filtered
+    # queryset is read as rows, before pagination
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        return self.get_serializer_class().read_rows(queryset)
@@ -0,0 +1,42 @@
+import hashlib
+
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+
+
+class ConditionalGetMixin:
+    # Conditional GET for user-scoped views. get_etag_validator() must be cheap (a
+    # version number or a single aggregate) and change whenever the response would;
+    # a matching If-None-Match is answered with 304 before the queryset is
+    # evaluated or anything is serialized. Views that return None (the default)
+    # are served as plain GETs without an ETag.
+
+    def get_etag_validator(self):
+        return None
+
+    def get_etag(self, request):
+        validator = self.get_etag_validator()
+        if validator is None:
+            return None
+        key = "|".join(
+            [
+                str(validator),
+                str(request.user.pk),
+                request.get_full_path(),
+                getattr(request, "accepted_media_type", ""),
+            ]
+        )
+        return quote_etag(hashlib.sha1(key.encode()).hexdigest())
+
+    def get(self, request, *args, **kwargs):
+        etag = self.get_etag(request)
+        if etag is None:
+            return super().get(request, *args, **kwargs)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response["ETag"] = etag
+            # Let browsers keep the body but revalidate it on every poll
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
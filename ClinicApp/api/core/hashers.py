@@ -0,0 +1,70 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher, ScryptPasswordHasher
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def run_hashing(func, *args):
+    # Hash on a pool sized to the CPU instead of the calling thread. Under ASGI every
+    # sync request gets its own thread, so a login spike would otherwise run as many
+    # memory-hard hashes at once as there are requests in flight.
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.PASSWORD_HASHING_WORKERS,
+                    thread_name_prefix="password-hashing",
+                )
+    return _executor.submit(func, *args).result()
+
+
+# Parameters are read from settings on every call, so changing them makes
+# must_update() true for existing hashes and they are rehashed on the next login.
+
+
+class TunedScryptPasswordHasher(ScryptPasswordHasher):
+    @property
+    def maxmem(self):
+        # scrypt needs 128 * n * r bytes; OpenSSL's default cap is 32 MiB
+        return max(32 * 1024 * 1024, 2 * 128 * self.work_factor * self.block_size)
+
+    @property
+    def work_factor(self):
+        return settings.PASSWORD_SCRYPT["WORK_FACTOR"]
+
+    @property
+    def block_size(self):
+        return settings.PASSWORD_SCRYPT["BLOCK_SIZE"]
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_SCRYPT["PARALLELISM"]
+
+    def encode(self, password, salt, n=None, r=None, p=None):
+        # verify() goes through encode(), so this covers both
+        return run_hashing(super().encode, password, salt, n, r, p)
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    @property
+    def time_cost(self):
+        return settings.PASSWORD_ARGON2["TIME_COST"]
+
+    @property
+    def memory_cost(self):
+        return settings.PASSWORD_ARGON2["MEMORY_COST"]
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_ARGON2["PARALLELISM"]
+
+    def encode(self, password, salt):
+        return run_hashing(super().encode, password, salt)
+
+    def verify(self, password, encoded):
+        return run_hashing(super().verify, password, encoded)
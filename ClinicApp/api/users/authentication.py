@@ -0,0 +1,90 @@
+from django.core.cache import caches
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+from .models import CustomUser
+
+
+def _cache_key(user_id):
+    return f"auth:user:{user_id}"
+
+
+def load_profile_ids(user):
+    # Attach doctor_id / patient_id to the user with one LEFT JOIN query, unless
+    # they are already there (e.g. on a user served from the auth cache)
+    if not hasattr(user, "doctor_id"):
+        user.doctor_id, user.patient_id = (
+            CustomUser.objects.filter(pk=user.pk)
+            .values_list("doctor__id", "patient__id")
+            .first()
+            or (None, None)
+        )
+    return user
+
+
+def invalidate_cached_user(user_id):
+    caches["auth"].delete(_cache_key(user_id))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    # JWTAuthentication that keeps the user, together with its role and profile ids,
+    # in the bounded "auth" cache for an access token lifetime. Entries are dropped
+    # by the users/appointments signal handlers whenever the user or a profile changes.
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+
+        cache = caches["auth"]
+        user = cache.get(_cache_key(user_id))
+        if user is None:
+            user = load_profile_ids(super().get_user(validated_token))
+            cache.set(
+                _cache_key(user_id),
+                user,
+                api_settings.ACCESS_TOKEN_LIFETIME.total_seconds(),
+            )
+            return user
+
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+            api_settings.REVOKE_TOKEN_CLAIM
+        ) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(
+                _("The user's password has been changed."), code="password_changed"
+            )
+        return user
+
+
+class TokenPrincipal(TokenUser):
+    # Authenticated principal built from the access token claims alone. It carries
+    # id, role and profile ids (see ClinicTokenObtainPairSerializer) and is only
+    # suitable for views that filter by those ids; it is not a CustomUser instance.
+
+    @property
+    def role(self):
+        return self.token.get("role")
+
+    @property
+    def doctor_id(self):
+        return self.token.get("doctor_id")
+
+    @property
+    def patient_id(self):
+        return self.token.get("patient_id")
+
+
+class TokenPrincipalAuthentication(CachedJWTAuthentication):
+    # Stateless variant: no users table or cache lookup when the token has the role
+    # claims. Tokens issued before the claims existed, or before the user had the
+    # profile for their role, fall back to the cached user.
+
+    def get_user(self, validated_token):
+        principal = TokenPrincipal(validated_token)
+        profile_ids = {"DOCTOR": principal.doctor_id, "PATIENT": principal.patient_id}
+        if principal.role is None or profile_ids.get(principal.role, True) is None:
+            return super().get_user(validated_token)
+        return principal
@@ -0,0 +1,96 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client, override_settings
+from django.urls import reverse
+from django.utils.module_loading import import_string
+
+from core.benchmarks import benchmark_database, Timer
+from users.models import CustomUser
+
+PASSWORD = "bench-password"
+
+
+class Command(BaseCommand):
+    help = "Measure login throughput for each configured password hasher"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--logins", type=int, default=100)
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+        parser.add_argument(
+            "--hasher",
+            action="append",
+            help="Algorithm to measure (scrypt, argon2, pbkdf2_sha256); repeatable. "
+            "Defaults to every configured hasher whose library is installed.",
+        )
+
+    def handle(self, *args, **options):
+        hashers = {
+            import_string(path).algorithm: path for path in settings.PASSWORD_HASHERS
+        }
+        algorithms = options["hasher"] or [
+            algorithm
+            for algorithm, path in hashers.items()
+            if self.available(import_string(path))
+        ]
+        workers = options["workers"]
+        # Threads beyond the CPU count or the hashing pool only queue up
+        cores = min(workers, os.cpu_count() or 1, settings.PASSWORD_HASHING_WORKERS)
+
+        self.stdout.write(
+            f"{'hasher':<16}{'logins':>8}{'logins/s':>11}{'per core':>10}{'ms/login':>10}"
+        )
+        with benchmark_database():
+            for algorithm in algorithms:
+                path = hashers[algorithm]
+                others = [p for p in settings.PASSWORD_HASHERS if p != path]
+                with override_settings(PASSWORD_HASHERS=[path, *others]):
+                    rate = self.measure(options["logins"], workers)
+                self.stdout.write(
+                    f"{algorithm:<16}{options['logins']:>8}{rate:>11.1f}"
+                    f"{rate / cores:>10.1f}{1000 / rate * workers:>10.1f}"
+                )
+
+    @staticmethod
+    def available(hasher_class):
+        if hasher_class.library is None:
+            return True
+        try:
+            hasher_class()._load_library()
+        except ValueError:
+            return False
+        return True
+
+    def measure(self, logins, workers):
+        CustomUser.objects.all().delete()
+        password = make_password(PASSWORD)
+        emails = [f"bench-user-{i}@example.com" for i in range(workers)]
+        CustomUser.objects.bulk_create(
+            CustomUser(email=email, password=password) for email in emails
+        )
+
+        url = reverse("token_obtain_pair")
+        errors = []
+
+        def login(i):
+            try:
+                response = Client(HTTP_HOST="localhost").post(
+                    url,
+                    {"email": emails[i % workers], "password": PASSWORD},
+                    content_type="application/json",
+                )
+            finally:
+                connection.close()
+            if response.status_code != 200:
+                errors.append(response.status_code)
+
+        with Timer() as timer:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                list(pool.map(login, range(logins)))
+        if errors:
+            self.stderr.write(f"{len(errors)} logins failed: {errors[:5]}")
+        return logins / timer.elapsed
@@ -1,4 +1,6 @@
 from rest_framework import serializers
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from .authentication import load_profile_ids
 from .models import CustomUser
 
 
@@ -51,3 +53,16 @@ class DoctorRegistrationSerializer(serializers.ModelSerializer):
 
     def validate(self, attrs):
         return attrs
+
+
+class ClinicTokenObtainPairSerializer(TokenObtainPairSerializer):
+    # Embed the role and profile ids so TokenPrincipalAuthentication can skip
+    # the user lookup. Refreshed access tokens copy these claims.
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        load_profile_ids(user)
+        token["role"] = user.role
+        token["doctor_id"] = user.doctor_id
+        token["patient_id"] = user.patient_id
+        return token
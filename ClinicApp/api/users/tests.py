@@ -1,3 +1,192 @@
+import os
+import tempfile
+import unittest
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection, connections
 from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from appointments.models import Doctor
+from .authentication import TokenPrincipal
+from .models import CustomUser
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        caches["auth"].clear()
+        self.user = CustomUser.objects.create_user(
+            email="doctor@example.com", password=None, role="DOCTOR"
+        )
+        self.doctor = Doctor.objects.create(
+            user=self.user, specialty="Diagnostics", license_number="L-1"
+        )
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}"
+        )
+
+    def test_cached_user_costs_no_auth_queries(self):
+        self.client.get("/api/schedules/")
+
+        # Only the schedule list query remains once the user is cached
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/schedules/")
+        self.assertEqual(response.status_code, 200)
+
+    def test_profile_update_invalidates_cache(self):
+        self.client.get("/api/users/me/")
+
+        response = self.client.patch(
+            "/api/users/me/update/", {"first_name": "Gregory"}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get("/api/users/me/").data["first_name"], "Gregory")
+
+    def test_deactivated_user_is_rejected(self):
+        self.client.get("/api/users/me/")
+
+        self.user.is_active = False
+        self.user.save()
+
+        self.assertEqual(self.client.get("/api/users/me/").status_code, 401)
+
+
+class TokenPrincipalTests(TestCase):
+    def setUp(self):
+        caches["auth"].clear()
+        self.user = CustomUser.objects.create_user(
+            email="doctor@example.com", password="pass", role="DOCTOR"
+        )
+        self.doctor = Doctor.objects.create(
+            user=self.user, specialty="Diagnostics", license_number="L-1"
+        )
+        self.client = APIClient()
+
+    def login(self):
+        response = self.client.post(
+            "/api/token/",
+            {"email": "doctor@example.com", "password": "pass"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_token_carries_role_claims(self):
+        token = AccessToken(self.login()["access"])
+
+        self.assertEqual(token["role"], "DOCTOR")
+        self.assertEqual(token["doctor_id"], self.doctor.id)
+        self.assertIsNone(token["patient_id"])
+
+    def test_refreshed_token_keeps_claims(self):
+        refresh = self.login()["refresh"]
+        response = self.client.post(
+            "/api/token/refresh/", {"refresh": refresh}, format="json"
+        )
+
+        token = AccessToken(response.data["access"])
+        self.assertEqual(token["doctor_id"], self.doctor.id)
+
+    def test_schedule_list_skips_users_table(self):
+        access = self.login()["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+
+        # Cold auth cache, yet only the schedule query runs
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/schedules/")
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(caches["auth"].get(f"auth:user:{self.user.id}"))
+
+    def test_token_without_profile_falls_back_to_user(self):
+        self.doctor.delete()
+        token = AccessToken(self.login()["access"])
+        self.doctor = Doctor.objects.create(
+            user=self.user, specialty="Diagnostics", license_number="L-2"
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        response = self.client.get("/api/schedules/")
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(TokenPrincipal(token).doctor_id)
+        # Resolved through the cached user, which has the new profile id
+        self.assertEqual(
+            caches["auth"].get(f"auth:user:{self.user.id}").doctor_id, self.doctor.id
+        )
+
+
+class PasswordHashingTests(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(email="patient@example.com")
+
+    def login(self):
+        return APIClient().post(
+            "/api/token/",
+            {"email": "patient@example.com", "password": "secret-pass"},
+            format="json",
+        )
+
+    def test_legacy_hash_is_upgraded_on_login(self):
+        self.user.password = make_password("secret-pass", hasher="pbkdf2_sha256")
+        self.user.save()
+
+        self.assertEqual(self.login().status_code, 200)
+
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith("scrypt$16384$"))
+
+    def test_changed_parameters_are_applied_on_login(self):
+        self.user.set_password("secret-pass")
+        self.user.save()
+
+        scrypt = {"WORK_FACTOR": 2**12, "BLOCK_SIZE": 8, "PARALLELISM": 1}
+        with self.settings(PASSWORD_SCRYPT=scrypt):
+            self.assertEqual(self.login().status_code, 200)
+
+        self.user.refresh_from_db()
+        _, work_factor, _, block_size, parallelism, _ = self.user.password.split("$")
+        self.assertEqual((work_factor, block_size, parallelism), ("4096", "8", "1"))
+
+
+@unittest.skipUnless(connection.vendor == "sqlite", "SQLite profile")
+class SQLiteProfileTests(TestCase):
+    def connect(self, directory):
+        # A fresh connection to a file database, so journal_mode=wal can apply
+        settings_dict = {
+            **connections["default"].settings_dict,
+            "NAME": os.path.join(directory, "db.sqlite3"),
+        }
+        wrapper = type(connections["default"])(settings_dict, alias="profile-test")
+        try:
+            wrapper.ensure_connection()
+            return {
+                name: wrapper.connection.execute(f"PRAGMA {name}").fetchone()[0]
+                for name in ("journal_mode", "synchronous", "busy_timeout", "mmap_size")
+            }
+        finally:
+            wrapper.close()
+
+    def test_new_connections_are_tuned(self):
+        with tempfile.TemporaryDirectory() as directory:
+            pragmas = self.connect(directory)
+
+        self.assertEqual(
+            pragmas,
+            {
+                "journal_mode": "wal",
+                "synchronous": 1,  # NORMAL
+                "busy_timeout": settings.SQLITE_PRAGMAS["busy_timeout"],
+                "mmap_size": settings.SQLITE_PRAGMAS["mmap_size"],
+            },
+        )
 
-# Create your tests here.
+    def test_rejects_malformed_pragma_values(self):
+        pragmas = {**settings.SQLITE_PRAGMAS, "synchronous": "off; DROP TABLE x"}
+        with tempfile.TemporaryDirectory() as directory:
+            with self.settings(SQLITE_PRAGMAS=pragmas):
+                with self.assertRaises(ImproperlyConfigured):
+                    self.connect(directory)
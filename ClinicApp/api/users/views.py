@@ -1,5 +1,6 @@
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
+from .authentication import load_profile_ids
 from .models import CustomUser
 from .serializers import (
     PatientRegistrationSerializer,
@@ -62,13 +63,9 @@ class CurrentUserView(generics.RetrieveAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_object(self):
-        user = self.request.user
-
-        try:
-            doctor = Doctor.objects.get(user=user)
-            user.doctor_profile = doctor.id
-        except Doctor.DoesNotExist:
-            pass
+        user = load_profile_ids(self.request.user)
+        if user.doctor_id is not None:
+            user.doctor_profile = user.doctor_id
 
         return user
 
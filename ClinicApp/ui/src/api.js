@@ -15,4 +15,15 @@ api.interceptors.request.use(config => {
     return Promise.reject(error);
 });
 
+// Follow keyset "next" links until the last page
+export const fetchAllPages = async (url, params) => {
+    let response = await api.get(url, { params });
+    const results = [...response.data.results];
+    while (response.data.next) {
+        response = await api.get(response.data.next);
+        results.push(...response.data.results);
+    }
+    return results;
+};
+
 export default api;
\ No newline at end of file
@@ -2,37 +2,127 @@ import React, { useState, useEffect } from 'react';
 import { BellIcon, CheckCircleIcon } from '@heroicons/react/24/outline';
 import api from '../api';
 
+const POLL_INTERVAL_MS = 30000;
+const RECONNECT_DELAY_MS = 5000;
+
 const NotificationBell = () => {
     const [notifications, setNotifications] = useState([]);
     const [unreadCount, setUnreadCount] = useState(0);
     const [isOpen, setIsOpen] = useState(false);
 
     useEffect(() => {
-        fetchNotifications();
+        let source;
+        let poller;
+        let reopen;
+        let cancelled = false;
+        let lastId = 0;
+        const seen = new Set();
+
+        const startPolling = () => {
+            if (!poller) poller = setInterval(fetchNotifications, POLL_INTERVAL_MS);
+        };
+
+        // New notifications are pushed over server-sent events instead of polling.
+        // The stream is opened with a short-lived ticket so the access token never
+        // appears in a URL; servers without streaming (runserver) answer 204.
+        const openStream = async () => {
+            let response;
+            try {
+                response = await api.post('/api/notifications/stream/ticket/');
+            } catch (error) {
+                startPolling();
+                return;
+            }
+            if (cancelled) return;
+            if (response.status === 204) {
+                startPolling();
+                return;
+            }
+
+            const stream = new EventSource(
+                `${api.defaults.baseURL}api/notifications/stream/?ticket=${encodeURIComponent(response.data.ticket)}&last_id=${lastId}`
+            );
+            source = stream;
+            stream.addEventListener('notification', event => {
+                const notification = JSON.parse(event.data);
+                // A reconnect replays the backlog; count each notification once
+                if (seen.has(notification.id)) return;
+                seen.add(notification.id);
+                lastId = Math.max(lastId, notification.id);
+                setNotifications(prev => [notification, ...prev]);
+                if (!notification.is_read) {
+                    setUnreadCount(prev => prev + 1);
+                }
+            });
+            // Dropped connections are retried by EventSource itself and stay
+            // CONNECTING; once the ticket is refused (it is short-lived, and the
+            // stream ends with the access token) the source is CLOSED, so open a
+            // new one with a fresh ticket.
+            stream.addEventListener('error', () => {
+                if (stream.readyState !== EventSource.CLOSED) return;
+                stream.close();
+                reopen = setTimeout(openStream, RECONNECT_DELAY_MS);
+            });
+        };
+
+        const connect = async () => {
+            const loaded = await fetchNotifications();
+            if (cancelled || !localStorage.getItem('access_token')) return;
+            loaded.forEach(n => seen.add(n.id));
+            lastId = loaded.reduce((max, n) => Math.max(max, n.id), 0);
+            openStream();
+        };
+
+        connect();
+        return () => {
+            cancelled = true;
+            if (source) source.close();
+            clearInterval(poller);
+            clearTimeout(reopen);
+        };
     }, []);
 
     const fetchNotifications = async () => {
         try {
-            const response = await api.get('/api/notifications/');
-            setNotifications(response.data);
-            setUnreadCount(response.data.filter(n => !n.is_read).length);
+            const [listResponse, countResponse] = await Promise.all([
+                api.get('/api/notifications/'),
+                api.get('/api/notifications/unread-count/'),
+            ]);
+            setNotifications(listResponse.data.results);
+            setUnreadCount(countResponse.data.unread_count);
+            return listResponse.data.results;
         } catch (error) {
             console.error('Error fetching notifications:', error);
+            return [];
         }
     };
 
     const markAsRead = async (id) => {
         try {
             await api.patch(`/api/notifications/${id}/`, { is_read: true });
-            setNotifications(notifications.map(n =>
+            setNotifications(prev => prev.map(n =>
                 n.id === id ? { ...n, is_read: true } : n
             ));
-            setUnreadCount(unreadCount - 1);
+            setUnreadCount(prev => prev - 1);
         } catch (error) {
             console.error('Error marking notification as read:', error);
         }
     };
 
+    const markAllAsRead = async () => {
+        const lastId = notifications.reduce((max, n) => Math.max(max, n.id), 0);
+        try {
+            await api.post('/api/notifications/mark-read/', { up_to: lastId });
+            setNotifications(prev => prev.map(n =>
+                n.id <= lastId ? { ...n, is_read: true } : n
+            ));
+            const countResponse = await api.get('/api/notifications/unread-count/');
+            setUnreadCount(countResponse.data.unread_count);
+        } catch (error) {
+            console.error('Error marking notifications as read:', error);
+        }
+    };
+
     return (
         <div className="relative">
             {/* Botón de campana */}
@@ -54,6 +144,14 @@ const NotificationBell = () => {
                     <div className="px-4 py-3 border-b border-gray-200 flex items-center space-x-2">
                         <BellIcon className="h-5 w-5 text-blue-600" />
                         <h3 className="text-sm font-semibold text-gray-700">Notifications</h3>
+                        {unreadCount > 0 && (
+                            <button
+                                onClick={markAllAsRead}
+                                className="ml-auto text-xs text-blue-600 hover:text-blue-800"
+                            >
+                                Mark all as read
+                            </button>
+                        )}
                     </div>
 
                     <div className="max-h-72 overflow-y-auto">
@@ -5,6 +5,7 @@ import { Trash2 } from 'lucide-react';
 const AdminDashboardPage = () => {
     const [doctors, setDoctors] = useState([]);
     const [appointments, setAppointments] = useState([]);
+    const [nextAppointmentsUrl, setNextAppointmentsUrl] = useState(null);
     const [loading, setLoading] = useState(true);
     const [activeTab, setActiveTab] = useState('doctors');
     const [error, setError] = useState('');
@@ -18,7 +19,8 @@ const AdminDashboardPage = () => {
                     setDoctors(response.data);
                 } else {
                     const response = await api.get('/api/appointments/');
-                    setAppointments(response.data);
+                    setAppointments(response.data.results);
+                    setNextAppointmentsUrl(response.data.next);
                 }
             } catch (error) {
                 setError(`Failed to load ${activeTab}`);
@@ -31,6 +33,17 @@ const AdminDashboardPage = () => {
         fetchData();
     }, [activeTab]);
 
+    const loadMoreAppointments = async () => {
+        try {
+            const response = await api.get(nextAppointmentsUrl);
+            setAppointments(prev => [...prev, ...response.data.results]);
+            setNextAppointmentsUrl(response.data.next);
+        } catch (error) {
+            setError('Failed to load appointments');
+            console.error('Error fetching appointments:', error);
+        }
+    };
+
     const [showAddDoctor, setShowAddDoctor] = useState(false);
     const [newDoctor, setNewDoctor] = useState({
         email: '',
@@ -235,15 +248,15 @@ const AdminDashboardPage = () => {
                                             <tr key={appointment.id}>
                                                 <td className="px-6 py-4 whitespace-nowrap">
                                                     <div className="text-sm font-medium text-gray-900">Dr. {appointment.doctor_name || 'N/A'}</div>
-                                                    <div className="text-sm text-gray-500">{appointment.schedule.doctor.specialty}</div>
+                                                    <div className="text-sm text-gray-500">{appointment.specialty}</div>
                                                 </td>
                                                 <td className="px-6 py-4 whitespace-nowrap">
                                                     <div className="text-sm font-medium text-gray-900">{appointment.patient_name || 'N/A'}</div>
-                                                    <div className="text-sm text-gray-500">{appointment.patient.user.email}</div>
+                                                    <div className="text-sm text-gray-500">{appointment.patient_email}</div>
                                                 </td>
                                                 <td className="px-6 py-4 whitespace-nowrap">
-                                                    <div className="text-sm text-gray-900">{formatDate(appointment.schedule.date)}</div>
-                                                    <div className="text-sm text-gray-500">{formatTime(appointment.schedule.start_time)} - {formatTime(appointment.schedule.end_time)}</div>
+                                                    <div className="text-sm text-gray-900">{formatDate(appointment.date)}</div>
+                                                    <div className="text-sm text-gray-500">{formatTime(appointment.start_time)} - {formatTime(appointment.end_time)}</div>
                                                 </td>
                                                 <td className="px-6 py-4 whitespace-nowrap">
                                                     <span
@@ -261,6 +274,16 @@ const AdminDashboardPage = () => {
                                         ))}
                                     </tbody>
                                 </table>
+                                {nextAppointmentsUrl && (
+                                    <div className="p-4 text-center border-t border-gray-200">
+                                        <button
+                                            onClick={loadMoreAppointments}
+                                            className="text-sm text-blue-600 hover:text-blue-800"
+                                        >
+                                            Load more
+                                        </button>
+                                    </div>
+                                )}
                             </div>
                         ) : (
                             <div className="bg-white rounded-lg shadow-md p-8 text-center">
@@ -1,5 +1,5 @@
 import React, { useState, useEffect } from 'react';
-import api from '../api';
+import api, { fetchAllPages } from '../api';
 import { Calendar, CheckCircle, XCircle } from 'lucide-react';
 
 const DoctorDashboardPage = () => {
@@ -18,11 +18,9 @@ const DoctorDashboardPage = () => {
         const fetchAppointments = async () => {
             try {
                 setLoading(true);
-                const response = await api.get('/api/appointments/', {
-                    params: { date: selectedDate }
-                });
-
-                setAppointments(response.data);
+                setAppointments(
+                    await fetchAllPages('/api/appointments/', { date: selectedDate })
+                );
             } catch (error) {
                 setError('Failed to load appointments');
                 console.error('Error fetching appointments:', error);
@@ -101,16 +99,13 @@ const DoctorDashboardPage = () => {
                                 {appointments.map(appointment => (
                                     <tr key={appointment.id} className="hover:bg-gray-50">
                                         <td className="px-6 py-4">
-                                            <div className="text-sm font-medium text-gray-900">
-                                                {appointment.patient.user.first_name} {appointment.patient.user.last_name}
-                                            </div>
                                             <div className="text-sm text-gray-900">
                                                 <strong>{appointment.patient_name || 'N/A'}</strong>
                                             </div>
                                         </td>
                                         <td className="px-6 py-4">
                                             <div className="text-sm text-gray-900">
-                                                {formatTime(appointment.schedule.start_time)} - {formatTime(appointment.schedule.end_time)}
+                                                {formatTime(appointment.start_time)} - {formatTime(appointment.end_time)}
                                             </div>
                                         </td>
                                         <td className="px-6 py-4">
@@ -11,10 +11,10 @@ const DoctorSearchPage = () => {
     const searchDoctors = async () => {
         setLoading(true);
         try {
-            const response = await api.get('/api/doctors/by-specialty/', {
-                params: { specialty }
+            const response = await api.get('/api/doctors/search/', {
+                params: { q: specialty }
             });
-            setDoctors(response.data);
+            setDoctors(response.data.results);
         } catch (error) {
             console.error('Error searching doctors:', error);
         } finally {
@@ -38,7 +38,7 @@ const DoctorSearchPage = () => {
                 <div className="flex items-center mb-8">
                     <input
                         type="text"
-                        placeholder="Search by specialty (e.g. Cardiology)"
+                        placeholder="Search by specialty or name (e.g. Cardiology)"
                         className="flex-grow px-4 py-3 border border-gray-300 rounded-l-xl focus:ring-2 focus:ring-blue-500 focus:outline-none"
                         value={specialty}
                         onChange={(e) => setSpecialty(e.target.value)}
@@ -59,13 +59,10 @@ const DoctorSearchPage = () => {
                         {doctors.map((doctor) => (
                             <div key={doctor.id} className="bg-white border rounded-xl shadow-md p-6 hover:shadow-lg transition">
                                 <h2 className="text-xl font-semibold text-gray-800 mb-2">
-                                    Dr. {doctor.user.first_name} {doctor.user.last_name}
+                                    Dr. {doctor.name}
                                 </h2>
-                                <p className="text-gray-700 mb-2">
-                                    <span className="font-medium">Specialty:</span> {doctor.specialty}
-                                </p>
                                 <p className="text-gray-700 mb-4">
-                                    <span className="font-medium">License:</span> {doctor.license_number}
+                                    <span className="font-medium">Specialty:</span> {doctor.specialty}
                                 </p>
                                 <Link
                                     to={`/doctor/${doctor.id}/schedule`}
@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { XCircle } from 'lucide-react';
-import api from '../api';
+import api, { fetchAllPages } from '../api';
 
 const PatientAppointmentsPage = () => {
     const [appointments, setAppointments] = useState([]);
@@ -10,8 +10,7 @@ const PatientAppointmentsPage = () => {
     useEffect(() => {
         const fetchAppointments = async () => {
             try {
-                const response = await api.get('/api/appointments/');
-                setAppointments(response.data);
+                setAppointments(await fetchAllPages('/api/appointments/'));
             } catch (error) {
                 setError('Failed to load appointments');
                 console.error('Error fetching appointments:', error);
@@ -105,17 +104,17 @@ const PatientAppointmentsPage = () => {
                                                 Dr. {appointment.doctor_name || 'N/A'}
                                             </div>
                                             <div className="text-sm text-gray-500">
-                                                {appointment.schedule?.doctor?.specialty || ''}
+                                                {appointment.specialty || ''}
                                             </div>
                                         </td>
                                         <td className="px-6 py-4 whitespace-nowrap">
                                             <div className="text-sm text-gray-900">
-                                                {appointment.schedule?.date
-                                                    ? formatDate(appointment.schedule.date)
+                                                {appointment.date
+                                                    ? formatDate(appointment.date)
                                                     : 'N/A'}
                                             </div>
                                             <div className="text-sm text-gray-500">
-                                                {formatTime(appointment.schedule?.start_time)} - {formatTime(appointment.schedule?.end_time)}
+                                                {formatTime(appointment.start_time)} - {formatTime(appointment.end_time)}
                                             </div>
                                         </td>
                                         <td className="px-6 py-4 whitespace-nowrap">
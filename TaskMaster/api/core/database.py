@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    # Applies settings.SQLITE_PRAGMAS to every new SQLite connection. WAL lets
+    # readers run next to the single writer, synchronous=NORMAL only syncs at
+    # checkpoints (the database stays consistent, but a power loss can drop the
+    # latest commits; use "full" where that matters), busy_timeout makes writers
+    # queue for the lock instead of failing and mmap_size serves reads from the
+    # page cache.
+    if connection.vendor != "sqlite":
+        return
+    for name, value in settings.SQLITE_PRAGMAS.items():
+        if not str(value).isalnum():
+            raise ImproperlyConfigured(f"Invalid SQLite pragma {name}={value!r}")
+        # On the raw connection so the statements are not logged as queries
+        connection.connection.execute(f"PRAGMA {name} = {value}")
@@ -1,5 +1,8 @@
+import os
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -32,6 +35,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "core",
     "users",
     "rest_framework",
     "rest_framework.authtoken",
@@ -72,16 +76,124 @@ WSGI_APPLICATION = "core.wsgi.application"
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
-
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+# DATABASE_ENGINE selects the profile: "sqlite" (default) or "postgresql".
+# `manage.py bench_write_contention` measures write throughput for either.
+
+DATABASE_ENGINE = os.environ.get("DATABASE_ENGINE", "sqlite")
+
+# Persistent connections are per thread, which ASGI servers do not reuse
+# reliably, so Django advises against them there; core.asgi sets DJANGO_ASGI.
+# DATABASE_CONN_MAX_AGE overrides either default.
+DATABASE_CONN_MAX_AGE = int(
+    os.environ.get(
+        "DATABASE_CONN_MAX_AGE", 0 if os.environ.get("DJANGO_ASGI") else 60
+    )
+)
+
+if DATABASE_ENGINE == "postgresql":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.environ.get("DATABASE_NAME", "taskmaster"),
+            "USER": os.environ.get("DATABASE_USER", ""),
+            "PASSWORD": os.environ.get("DATABASE_PASSWORD", ""),
+            "HOST": os.environ.get("DATABASE_HOST", ""),
+            "PORT": os.environ.get("DATABASE_PORT", ""),
+            # Keep connections open across requests, checked before being reused
+            "CONN_MAX_AGE": DATABASE_CONN_MAX_AGE,
+            "CONN_HEALTH_CHECKS": True,
+            "OPTIONS": {},
+        }
     }
+    # Optional psycopg 3 connection pool (pip install "psycopg[pool]"). Django
+    # requires persistent connections to be off when it is used.
+    if os.environ.get("DATABASE_POOL_MAX_SIZE"):
+        DATABASES["default"]["CONN_MAX_AGE"] = 0
+        DATABASES["default"]["OPTIONS"]["pool"] = {
+            "min_size": int(os.environ.get("DATABASE_POOL_MIN_SIZE", 2)),
+            "max_size": int(os.environ["DATABASE_POOL_MAX_SIZE"]),
+            "timeout": int(os.environ.get("DATABASE_POOL_TIMEOUT", 10)),
+        }
+elif DATABASE_ENGINE == "sqlite":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.environ.get("DATABASE_NAME", BASE_DIR / "db.sqlite3"),
+            "CONN_MAX_AGE": DATABASE_CONN_MAX_AGE,
+            "OPTIONS": {
+                # BEGIN IMMEDIATE takes the write lock up front, so a transaction
+                # that reads before writing waits for busy_timeout instead of
+                # failing with "database is locked" when it upgrades its lock
+                "transaction_mode": os.environ.get(
+                    "SQLITE_TRANSACTION_MODE", "IMMEDIATE"
+                ),
+            },
+        }
+    }
+else:
+    raise ImproperlyConfigured(f"Unsupported DATABASE_ENGINE {DATABASE_ENGINE!r}")
+
+# Applied to each new SQLite connection by core.database
+SQLITE_PRAGMAS = {
+    "journal_mode": os.environ.get("SQLITE_JOURNAL_MODE", "wal"),
+    "synchronous": os.environ.get("SQLITE_SYNCHRONOUS", "normal"),
+    "busy_timeout": int(os.environ.get("SQLITE_BUSY_TIMEOUT", 5000)),  # ms
+    "mmap_size": int(os.environ.get("SQLITE_MMAP_SIZE", 128 * 1024 * 1024)),
 }
 
 AUTH_USER_MODEL = "users.CustomUser"
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# "auth" holds authenticated users keyed by id (see users.authentication); use a
+# shared backend when running several processes so invalidation reaches all of them.
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "auth": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "auth",
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    },
+}
+
+# Password hashing
+# https://docs.djangoproject.com/en/5.2/topics/auth/passwords/
+# PASSWORD_HASHER picks the algorithm for new hashes (scrypt needs no extra package,
+# argon2 needs argon2-cffi). The others stay listed so existing hashes keep working;
+# they are upgraded to the current algorithm and parameters on the next login.
+
+PASSWORD_HASHER = os.environ.get("PASSWORD_HASHER", "scrypt")
+
+_PASSWORD_HASHERS = {
+    "scrypt": "core.hashers.TunedScryptPasswordHasher",
+    "argon2": "core.hashers.TunedArgon2PasswordHasher",
+    "pbkdf2": "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+}
+
+PASSWORD_HASHERS = [_PASSWORD_HASHERS.pop(PASSWORD_HASHER), *_PASSWORD_HASHERS.values()]
+
+# CPU cost grows with WORK_FACTOR * BLOCK_SIZE * PARALLELISM; memory with the first two
+PASSWORD_SCRYPT = {
+    "WORK_FACTOR": int(os.environ.get("PASSWORD_SCRYPT_WORK_FACTOR", 2**14)),
+    "BLOCK_SIZE": int(os.environ.get("PASSWORD_SCRYPT_BLOCK_SIZE", 8)),
+    "PARALLELISM": int(os.environ.get("PASSWORD_SCRYPT_PARALLELISM", 5)),
+}
+
+# OWASP's minimum argon2id profile: 19 MiB, 2 iterations, 1 lane
+PASSWORD_ARGON2 = {
+    "TIME_COST": int(os.environ.get("PASSWORD_ARGON2_TIME_COST", 2)),
+    "MEMORY_COST": int(os.environ.get("PASSWORD_ARGON2_MEMORY_COST", 19456)),
+    "PARALLELISM": int(os.environ.get("PASSWORD_ARGON2_PARALLELISM", 1)),
+}
+
+# Hashes run on a shared pool of this many threads (see core.hashers.run_hashing)
+PASSWORD_HASHING_WORKERS = int(
+    os.environ.get("PASSWORD_HASHING_WORKERS", os.cpu_count() or 1)
+)
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -126,10 +238,20 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # JWT Configuration
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "users.authentication.CachedJWTAuthentication",
     ),
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 5,  # 5 task per page
+    # orjson-backed when installed, stock json otherwise (see core.fastjson)
+    "DEFAULT_RENDERER_CLASSES": [
+        "core.fastjson.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "core.fastjson.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
 }
 
 # Simple JWT settings
@@ -139,3 +261,7 @@ SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=60),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
 }
+
+# Seconds before a logout recorded by another process is enforced here
+# (see users.revocation). Run `manage.py prune_revoked_tokens` periodically.
+TOKEN_REVOCATION_SYNC_INTERVAL = 5
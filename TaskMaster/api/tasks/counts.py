@@ -0,0 +1,25 @@
+from django.core.cache import cache
+from .models import Task
+
+COUNT_CACHE_TIMEOUT = 60 * 5
+
+
+def _cache_key(owner_id, completed):
+    return f"tasks:count:{owner_id}:{completed}"
+
+
+def task_count(owner_id, completed=None):
+    # Per-user task totals for list pagination, cached until the user's tasks change
+    key = _cache_key(owner_id, completed)
+    count = cache.get(key)
+    if count is None:
+        queryset = Task.objects.filter(owner_id=owner_id)
+        if completed is not None:
+            queryset = queryset.filter(completed=completed)
+        count = queryset.count()
+        cache.set(key, count, COUNT_CACHE_TIMEOUT)
+    return count
+
+
+def invalidate_task_counts(owner_id):
+    cache.delete_many([_cache_key(owner_id, c) for c in (None, True, False)])
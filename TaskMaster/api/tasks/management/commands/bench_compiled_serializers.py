@@ -0,0 +1,56 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+
+from core.benchmarks import benchmark_database, Timer
+from tasks.models import Task
+from tasks.serializers import TaskSerializer
+from users.models import CustomUser
+
+
+class Command(BaseCommand):
+    help = "Compare DRF and compiled row serialization of tasks in rows/sec"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tasks", type=int, default=5000)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        count = options["tasks"]
+        with benchmark_database():
+            user = CustomUser.objects.create_user(email="bench@example.com")
+            Task.objects.bulk_create(
+                Task(
+                    title=f"Task {i}",
+                    description="Benchmark task " * 4,
+                    due_date=datetime.date(2030, 1, 1)
+                    + datetime.timedelta(days=i % 365),
+                    priority=("low", "medium", "high")[i % 3],
+                    owner=user,
+                )
+                for i in range(count)
+            )
+            queryset = Task.objects.filter(owner=user).order_by("due_date", "id")
+            variants = [
+                ("instances", lambda: queryset.all()),
+                ("compiled rows", lambda: TaskSerializer.read_rows(queryset)),
+            ]
+
+            self.stdout.write(
+                f"{'mode':<16}{'fetch+serialize rows/s':>24}{'serialize rows/s':>18}"
+            )
+            for name, rows in variants:
+                best_total = best_serialize = None
+                for _ in range(options["repeat"]):
+                    with Timer() as total:
+                        objects = list(rows())
+                        with Timer() as serialize:
+                            TaskSerializer(objects, many=True).data
+                    best_total = min(best_total or total.elapsed, total.elapsed)
+                    best_serialize = min(
+                        best_serialize or serialize.elapsed, serialize.elapsed
+                    )
+                self.stdout.write(
+                    f"{name:<16}{count / best_total:>24,.0f}"
+                    f"{count / best_serialize:>18,.0f}"
+                )
@@ -0,0 +1,62 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+from django.test import Client
+from rest_framework_simplejwt.tokens import AccessToken
+
+from core.benchmarks import benchmark_database, QueryCounter, Timer
+from tasks.models import Task
+from users.models import CustomUser
+
+
+class Command(BaseCommand):
+    help = "Compare full and conditional (If-None-Match) polls of the task views"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tasks", type=int, default=5000)
+        parser.add_argument("--polls", type=int, default=200)
+        parser.add_argument("--page-size", type=int, default=100)
+
+    def handle(self, *args, **options):
+        with benchmark_database():
+            user = CustomUser.objects.create_user(email="bench@example.com")
+            Task.objects.bulk_create(
+                Task(
+                    title=f"Task {i}",
+                    description="Benchmark task " * 4,
+                    due_date=datetime.date(2030, 1, 1)
+                    + datetime.timedelta(days=i % 365),
+                    owner=user,
+                )
+                for i in range(options["tasks"])
+            )
+            # A first write creates the owner's TaskStats row and version
+            Task.objects.filter(owner=user).first().mark_as_completed()
+
+            client = Client(
+                HTTP_HOST="localhost",
+                HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}",
+            )
+            urls = [
+                f"/api/tasks/list/?page_size={options['page_size']}",
+                f"/api/tasks/list/?cursor=&page_size={options['page_size']}",
+                f"/api/tasks/{Task.objects.filter(owner=user).first().id}/",
+            ]
+
+            self.stdout.write(
+                f"{'url':<40}{'mode':<8}{'status':>7}{'queries':>9}"
+                f"{'bytes':>9}{'ms/poll':>9}"
+            )
+            for url in urls:
+                etag = client.get(url)["ETag"]
+                modes = (("full", {}), ("etag", {"HTTP_IF_NONE_MATCH": etag}))
+                for mode, headers in modes:
+                    with QueryCounter() as queries, Timer() as timer:
+                        for _ in range(options["polls"]):
+                            response = client.get(url, **headers)
+                    self.stdout.write(
+                        f"{url[:39]:<40}{mode:<8}{response.status_code:>7}"
+                        f"{queries.count / options['polls']:>9.1f}"
+                        f"{len(response.content):>9}"
+                        f"{timer.elapsed / options['polls'] * 1000:>9.2f}"
+                    )
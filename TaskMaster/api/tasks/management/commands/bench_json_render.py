@@ -0,0 +1,73 @@
+import datetime
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from core import fastjson
+from core.benchmarks import benchmark_database, Timer
+from tasks.models import Task
+from tasks.serializers import TaskSerializer
+from users.models import CustomUser
+
+
+class Command(BaseCommand):
+    help = "Compare the stock and orjson-backed JSON renderers on task payloads"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tasks", type=int, default=1000)
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        if fastjson.orjson is None:
+            raise CommandError("orjson is not installed; FastJSONRenderer falls back")
+
+        with benchmark_database():
+            user = CustomUser.objects.create_user(email="bench@example.com")
+            Task.objects.bulk_create(
+                Task(
+                    title=f"Task {i} — review",
+                    description="Benchmark task with some notes. " * 4,
+                    due_date=datetime.date(2030, 1, 1)
+                    + datetime.timedelta(days=i % 365),
+                    priority=("low", "medium", "high")[i % 3],
+                    owner=user,
+                )
+                for i in range(options["tasks"])
+            )
+            # Serialize once: the comparison is about rendering the same data
+            tasks = TaskSerializer(Task.objects.order_by("id"), many=True).data
+            payloads = [
+                ("TaskSerializer list", tasks),
+                # Page envelope as returned by the task list view
+                (
+                    "TaskSerializer page",
+                    {
+                        "count": len(tasks),
+                        "next": None,
+                        "previous": None,
+                        "results": tasks[:100],
+                    },
+                ),
+            ]
+
+        self.stdout.write(
+            f"{'payload':<22}{'renderer':<20}{'bytes':>10}{'best ms':>10}{'speedup':>9}"
+        )
+        for name, data in payloads:
+            baseline = None
+            rendered = []
+            for renderer in (JSONRenderer(), fastjson.FastJSONRenderer()):
+                best = None
+                for _ in range(options["repeat"]):
+                    with Timer() as timer:
+                        content = renderer.render(data)
+                    best = timer.elapsed if best is None else min(best, timer.elapsed)
+                baseline = baseline or best
+                rendered.append(content)
+                self.stdout.write(
+                    f"{name:<22}{type(renderer).__name__:<20}{len(content):>10}"
+                    f"{best * 1000:>10.2f}{baseline / best:>8.1f}x"
+                )
+            if json.loads(rendered[0]) != json.loads(rendered[1]):
+                self.stdout.write(self.style.WARNING(f"{name}: outputs differ"))
@@ -0,0 +1,75 @@
+import datetime
+import random
+import statistics
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.benchmarks import benchmark_database, database_profile, run_concurrently
+from tasks.models import Task
+from tasks.stats import rebuild_stats
+from users.models import CustomUser
+
+
+class Command(BaseCommand):
+    help = (
+        "Toggle tasks from concurrent workers and report write throughput for the "
+        "configured database profile (see DATABASE_ENGINE in settings)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=8)
+        parser.add_argument("--operations", type=int, default=200)
+        parser.add_argument("--users", type=int, default=4)
+        parser.add_argument("--tasks", type=int, default=50)
+
+    def handle(self, *args, **options):
+        with benchmark_database():
+            users = [
+                CustomUser.objects.create_user(email=f"bench-{i}@example.com")
+                for i in range(options["users"])
+            ]
+            Task.objects.bulk_create(
+                Task(
+                    title=f"Task {i}",
+                    due_date=datetime.date(2030, 1, 1),
+                    owner=user,
+                )
+                for user in users
+                for i in range(options["tasks"])
+            )
+            rebuild_stats()
+            task_ids = list(Task.objects.values_list("id", flat=True))
+            profile = database_profile()
+
+            def toggle(worker, i):
+                # Read-then-write in one transaction, like the batch endpoint; every
+                # toggle also updates the owner's shared TaskStats row
+                with transaction.atomic():
+                    task = Task.objects.get(pk=random.choice(task_ids))
+                    if task.completed:
+                        task.mark_as_incomplete()
+                    else:
+                        task.mark_as_completed()
+
+            elapsed, latencies, errors = run_concurrently(
+                toggle, options["workers"], options["operations"]
+            )
+
+        attempts = options["workers"] * options["operations"]
+        self.stdout.write(f"profile:     {profile}")
+        self.stdout.write(
+            f"attempts:    {attempts} ({options['workers']} workers x "
+            f"{options['operations']} toggles)"
+        )
+        self.stdout.write(f"throughput:  {len(latencies) / elapsed:.1f} commits/s")
+        if latencies:
+            latencies = sorted(latencies)
+            p95 = latencies[int(len(latencies) * 0.95) - 1]
+            self.stdout.write(
+                f"latency:     p50 {statistics.median(latencies) * 1000:.1f} ms, "
+                f"p95 {p95 * 1000:.1f} ms, max {latencies[-1] * 1000:.1f} ms"
+            )
+        self.stdout.write(f"db errors:   {sum(errors.values())}")
+        for message, count in errors.most_common():
+            self.stdout.write(f"  {count:>6}  {message}")
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from tasks.stats import rebuild_stats
+
+
+class Command(BaseCommand):
+    help = "Recompute every user's TaskStats from the tasks table"
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            count = rebuild_stats()
+        self.stdout.write(f"Rebuilt task stats for {count} users")
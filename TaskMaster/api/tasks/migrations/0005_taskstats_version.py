@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0004_taskstats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='taskstats',
+            name='version',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+    ]
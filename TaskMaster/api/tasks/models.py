@@ -1,8 +1,29 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 
 User = get_user_model()
 
+# Task fields TaskStats counts by
+STATS_FIELDS = {"owner", "owner_id", "completed", "priority"}
+
+
+class TaskQuerySet(models.QuerySet):
+    def delete(self):
+        # Bulk deletes (batch endpoint, admin actions) skip Task.delete, so the
+        # deleted rows' states are read first and applied to TaskStats here
+        from .stats import record_changes
+
+        with transaction.atomic(using=self.db):
+            states = list(
+                self.select_for_update().values_list(
+                    "owner_id", "completed", "priority"
+                )
+            )
+            result = super().delete()
+            record_changes([(state, None) for state in states])
+        return result
+
 
 class Task(models.Model):
     class PriorityChoices(models.TextChoices):
@@ -21,17 +42,106 @@ class Task(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name="tasks")
 
+    objects = TaskQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # TaskListView: WHERE owner_id = ? [AND completed = ?] ORDER BY due_date, id
+            models.Index(
+                fields=["owner", "due_date", "id"], name="task_owner_due_idx"
+            ),
+            models.Index(
+                fields=["owner", "completed", "due_date", "id"],
+                name="task_owner_completed_due_idx",
+            ),
+        ]
+
     def __str__(self):
         return self.title
 
-    def mark_as_completed(self):
-        if not self.completed:
-            self.completed = True
-            self.save()
+    # TaskStats is adjusted by the difference between the row's state before and
+    # after each write, read under a row lock so concurrent writes to the same task
+    # cannot both apply a delta computed from the same starting point
+
+    def get_stats_state(self):
+        if {"owner_id", "completed", "priority"} & self.get_deferred_fields():
+            return None
+        return (self.owner_id, self.completed, self.priority)
+
+    def get_stored_stats_state(self):
+        return (
+            Task.objects.select_for_update()
+            .filter(pk=self.pk)
+            .values_list("owner_id", "completed", "priority")
+            .first()
+        )
+
+    def save(self, *args, **kwargs):
+        from .stats import record_changes
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and not STATS_FIELDS & set(update_fields):
+            return super().save(*args, **kwargs)
+
+        with transaction.atomic():
+            old_state = None if self._state.adding else self.get_stored_stats_state()
+            super().save(*args, **kwargs)
+            new_state = self.get_stats_state() or self.get_stored_stats_state()
+            record_changes([(old_state, new_state)])
+
+    def delete(self, *args, **kwargs):
+        from .stats import record_changes
+
+        with transaction.atomic():
+            state = self.get_stored_stats_state()
+            result = super().delete(*args, **kwargs)
+            if state is not None and result[0]:
+                record_changes([(state, None)])
+        return result
+
+    def set_completed(self, completed):
+        from .stats import record_changes
+
+        # Conditional UPDATE: when the same task is toggled concurrently only the
+        # request that actually flips the row records the change
+        updated_at = timezone.now()
+        with transaction.atomic():
+            flipped = Task.objects.filter(pk=self.pk, completed=not completed).update(
+                completed=completed, updated_at=updated_at
+            )
+            if flipped:
+                record_changes(
+                    [
+                        (
+                            (self.owner_id, not completed, self.priority),
+                            (self.owner_id, completed, self.priority),
+                        )
+                    ]
+                )
+        self.completed = completed
+        if flipped:
+            self.updated_at = updated_at
         return self
 
+    def mark_as_completed(self):
+        return self.set_completed(True)
+
     def mark_as_incomplete(self):
-        if self.completed:
-            self.completed = False
-            self.save()
-        return self
+        return self.set_completed(False)
+
+
+class TaskStats(models.Model):
+    # Per-owner read model kept up to date by tasks.stats.record_changes
+    owner = models.OneToOneField(
+        User, on_delete=models.CASCADE, primary_key=True, related_name="task_stats"
+    )
+    total = models.PositiveIntegerField(default=0)
+    completed = models.PositiveIntegerField(default=0)
+    high = models.PositiveIntegerField(default=0)
+    medium = models.PositiveIntegerField(default=0)
+    low = models.PositiveIntegerField(default=0)
+    # Bumped on every change to the owner's tasks; the ETag validator for task views
+    version = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.owner_id}: {self.completed}/{self.total}"
@@ -0,0 +1,154 @@
+import base64
+import json
+from functools import partial, reduce
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class CountedPaginator(Paginator):
+    # Paginator whose total comes from a callable (e.g. a cached counter)
+    # instead of a COUNT(*) over the queryset
+    def __init__(self, object_list, per_page, count, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self._count = count
+
+    @cached_property
+    def count(self):
+        return self._count()
+
+
+class TaskPagination(PageNumberPagination):
+    # Page-number mode used by the dashboard. The total comes from the view's
+    # get_total_count() when it has one.
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+    def paginate_queryset(self, queryset, request, view=None):
+        get_total_count = getattr(view, "get_total_count", None)
+        if get_total_count is not None:
+            self.django_paginator_class = partial(
+                CountedPaginator, count=get_total_count
+            )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "count": self.page.paginator.count,
+                "total_pages": self.page.paginator.num_pages,
+                "current_page": self.page.number,
+                "results": data,
+            }
+        )
+
+
+class KeysetPagination(BasePagination):
+    # Forward-only keyset pagination over an ascending, unique composite ordering.
+    # Unlike DRF's CursorPagination the cursor holds every ordering column, so
+    # related-field orderings work and no page ever needs an OFFSET.
+    ordering = ()
+    page_size = 50
+    max_page_size = 200
+    page_size_query_param = "page_size"
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+
+        queryset = queryset.order_by(*self.ordering)
+        position = self.decode_cursor(request)
+        if position is not None:
+            try:
+                queryset = queryset.filter(self.after(position))
+            except ValidationError:
+                raise NotFound(self.invalid_cursor_message)
+
+        results = list(queryset[: self.page_size + 1])
+        self.has_next = len(results) > self.page_size
+        results = results[: self.page_size]
+        self.next_position = self.get_position(results[-1]) if self.has_next else None
+        return results
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(page_size, self.max_page_size))
+
+    def after(self, position):
+        # (a, b, c) > (x, y, z) spelled out as nested OR/AND so any backend can use
+        # the composite index
+        conditions = []
+        for i, field in enumerate(self.ordering):
+            equal = {f: value for f, value in zip(self.ordering[:i], position)}
+            conditions.append(Q(**equal, **{f"{field}__gt": position[i]}))
+        # The leading bound is implied by the OR, but it lets SQLite walk one index
+        # range in order instead of merging a scan per branch and sorting
+        leading = Q(**{f"{self.ordering[0]}__gte": position[0]})
+        return leading & reduce(lambda a, b: a | b, conditions)
+
+    def get_position(self, instance):
+        position = []
+        for field in self.ordering:
+            value = instance
+            for attr in field.split("__"):
+                value = getattr(value, attr)
+            position.append(str(value))
+        return position
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            position = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return position
+
+    def encode_cursor(self, position):
+        return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(self.next_position)
+        )
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+
+class TaskCursorPagination(KeysetPagination):
+    # Cursor mode over (due_date, id); deep pages cost the same as the first.
+    # The total is only computed when asked for with ?count=true.
+    ordering = ("due_date", "id")
+    page_size = 5
+    max_page_size = 100
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.count = None
+        if request.query_params.get("count", "").lower() in ["true", "1", "yes"]:
+            get_total_count = getattr(view, "get_total_count", queryset.count)
+            self.count = get_total_count()
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        if self.count is not None:
+            response.data["count"] = self.count
+        return response
@@ -1,8 +1,9 @@
 from rest_framework import serializers
+from core.compiled import CompiledListSerializer, CompiledReadMixin
 from .models import Task
 
 
-class TaskSerializer(serializers.ModelSerializer):
+class TaskSerializer(CompiledReadMixin, serializers.ModelSerializer):
     created_at = serializers.DateTimeField(format="%Y-%m-%d %H:%M", read_only=True)
     updated_at = serializers.DateTimeField(format="%Y-%m-%d %H:%M", read_only=True)
 
@@ -19,3 +20,25 @@ class TaskSerializer(serializers.ModelSerializer):
             "updated_at",
         ]
         read_only_fields = ["id", "completed", "created_at", "updated_at"]
+        list_serializer_class = CompiledListSerializer
+
+
+class TaskBatchSerializer(serializers.Serializer):
+    MAX_IDS = 1000
+    ACTION_CHOICES = ["complete", "incomplete", "delete", "set_priority", "reschedule"]
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(), allow_empty=False, max_length=MAX_IDS
+    )
+    action = serializers.ChoiceField(choices=ACTION_CHOICES)
+    priority = serializers.ChoiceField(
+        choices=Task.PriorityChoices.choices, required=False
+    )
+    due_date = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        if attrs["action"] == "set_priority" and "priority" not in attrs:
+            raise serializers.ValidationError({"priority": "This field is required."})
+        if attrs["action"] == "reschedule" and "due_date" not in attrs:
+            raise serializers.ValidationError({"due_date": "This field is required."})
+        return attrs
@@ -0,0 +1,111 @@
+from collections import Counter, defaultdict
+
+from django.db.models import Count, F, Q
+from django.utils import timezone
+from .counts import invalidate_task_counts
+from .models import Task, TaskStats
+
+PRIORITIES = [choice for choice, _ in Task.PriorityChoices.choices]
+COUNTERS = ["total", "completed", *PRIORITIES]
+
+
+def _counters(completed, priority):
+    return Counter({"total": 1, "completed": int(completed), priority: 1})
+
+
+def record_changes(changes, rebuild=()):
+    # Apply task state transitions to TaskStats with one UPDATE ... SET x = x + n per
+    # owner. changes are (old_state, new_state) pairs of (owner_id, completed,
+    # priority); None stands for "did not exist" / "no longer exists".
+    deltas = defaultdict(Counter)
+    for old, new in changes:
+        if old is not None:
+            deltas[old[0]].subtract(_counters(*old[1:]))
+        if new is not None:
+            deltas[new[0]].update(_counters(*new[1:]))
+
+    owners = set(rebuild)
+    for owner_id, delta in deltas.items():
+        invalidate_task_counts(owner_id)
+        if owner_id in owners:
+            continue
+        updated = TaskStats.objects.filter(owner_id=owner_id).update(
+            version=F("version") + 1,
+            **{name: F(name) + value for name, value in delta.items() if value},
+        )
+        if not updated:
+            # First change for this owner: start from an exact count
+            owners.add(owner_id)
+
+    if owners:
+        for owner_id in owners:
+            invalidate_task_counts(owner_id)
+        rebuild_stats(owners)
+        TaskStats.objects.filter(owner_id__in=owners).update(version=F("version") + 1)
+
+
+def rebuild_stats(owner_ids=None):
+    # Recompute TaskStats with a single GROUP BY over tasks; owners without tasks
+    # get zeroed rows. Returns the number of rows written.
+    tasks = Task.objects.all()
+    if owner_ids is not None:
+        tasks = tasks.filter(owner_id__in=owner_ids)
+    aggregates = {
+        row.pop("owner"): row
+        for row in tasks.values("owner")
+        .annotate(
+            total=Count("id"),
+            completed=Count("id", filter=Q(completed=True)),
+            **{p: Count("id", filter=Q(priority=p)) for p in PRIORITIES},
+        )
+        .order_by()
+    }
+
+    if owner_ids is None:
+        TaskStats.objects.exclude(owner_id__in=aggregates).update(
+            **{name: 0 for name in COUNTERS}
+        )
+        owner_ids = aggregates.keys()
+
+    rows = [
+        TaskStats(owner_id=owner_id, **aggregates.get(owner_id, {}))
+        for owner_id in owner_ids
+    ]
+    TaskStats.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=["owner"],
+        update_fields=COUNTERS,
+    )
+    return len(rows)
+
+
+def get_version(owner_id):
+    # One primary key lookup; owners without a row yet have never changed a task
+    version = (
+        TaskStats.objects.filter(owner_id=owner_id)
+        .values_list("version", flat=True)
+        .first()
+    )
+    return version or 0
+
+
+def get_stats(owner_id):
+    stats = TaskStats.objects.filter(owner_id=owner_id).first()
+    if stats is None:
+        rebuild_stats([owner_id])
+        stats = TaskStats.objects.get(owner_id=owner_id)
+
+    # Overdue depends on today's date, so it cannot be a stored counter; it is an
+    # index-only count over (owner, completed, due_date)
+    overdue = Task.objects.filter(
+        owner_id=owner_id, completed=False, due_date__lt=timezone.localdate()
+    ).count()
+
+    return {
+        "total": stats.total,
+        "completed": stats.completed,
+        "pending": stats.total - stats.completed,
+        "overdue": overdue,
+        "by_priority": {p: getattr(stats, p) for p in PRIORITIES},
+    }
@@ -1,3 +1,496 @@
+import datetime
+import json
+import unittest
+from io import StringIO
+
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework import generics
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
+from rest_framework_simplejwt.tokens import AccessToken
+
+from core.conditional import ConditionalGetMixin
+from core.fastjson import FastJSONRenderer
+from users.models import CustomUser
+from .models import Task, TaskStats
+from .pagination import TaskCursorPagination
+from .serializers import TaskSerializer
+from .views import TaskListView, TaskDetailView
+
+
+class TaskTestCase(TestCase):
+    def setUp(self):
+        caches["default"].clear()
+        caches["auth"].clear()
+        self.user = CustomUser.objects.create_user(email="user@example.com")
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}"
+        )
+        # Warm the auth cache so query counts only cover the view
+        self.client.get("/api/tasks/999/")
+
+    def add_tasks(self, count, **fields):
+        start = Task.objects.count()
+        Task.objects.bulk_create(
+            Task(
+                title=f"Task {i}",
+                # Three tasks per day so ties on due_date are broken by id
+                due_date=datetime.date(2030, 1, 1) + datetime.timedelta(days=i // 3),
+                owner=self.user,
+                **fields,
+            )
+            for i in range(start, start + count)
+        )
+
+
+class TaskListTests(TaskTestCase):
+    def test_page_mode_serves_count_from_cache(self):
+        self.add_tasks(12)
+
+        response = self.client.get("/api/tasks/list/?page=2")
+        self.assertEqual(response.data["count"], 12)
+        self.assertEqual(response.data["total_pages"], 3)
+        self.assertEqual(response.data["current_page"], 2)
+        self.assertEqual(len(response.data["results"]), 5)
+
+        # The total is cached, so only the ETag version and the page are queried
+        with self.assertNumQueries(2):
+            self.client.get("/api/tasks/list/?page=3")
+
+    def test_count_follows_task_changes(self):
+        self.add_tasks(3)
+        self.client.get("/api/tasks/list/")
+
+        self.client.post(
+            "/api/tasks/create/",
+            {"title": "New", "due_date": "2030-02-01"},
+            format="json",
+        )
+        self.assertEqual(self.client.get("/api/tasks/list/").data["count"], 4)
+
+        self.client.delete(f"/api/tasks/{Task.objects.first().id}/")
+        self.assertEqual(self.client.get("/api/tasks/list/").data["count"], 3)
+
+    def test_page_size_is_capped(self):
+        self.add_tasks(120)
+
+        response = self.client.get("/api/tasks/list/?page_size=1000")
+        self.assertEqual(len(response.data["results"]), 100)
+
+    def test_cursor_pages_cover_tasks_in_order(self):
+        self.add_tasks(11)
+
+        ids = []
+        url = "/api/tasks/list/?cursor=&page_size=4"
+        while url:
+            # ETag version plus the page
+            with self.assertNumQueries(2):
+                data = self.client.get(url).data
+            self.assertNotIn("count", data)
+            ids += [task["id"] for task in data["results"]]
+            url = data["next"]
+
+        self.assertEqual(
+            ids, list(Task.objects.order_by("due_date", "id").values_list("id", flat=True))
+        )
+
+    def test_cursor_mode_count_is_optional(self):
+        self.add_tasks(4)
+        self.add_tasks(2, completed=True)
+
+        response = self.client.get("/api/tasks/list/?cursor=&count=true&completed=true")
+        self.assertEqual(response.data["count"], 2)
+        self.assertEqual(len(response.data["results"]), 2)
+
+    def test_invalid_cursor(self):
+        response = self.client.get("/api/tasks/list/?cursor=bogus")
+        self.assertEqual(response.status_code, 404)
+
+
+class TaskBatchTests(TaskTestCase):
+    def setUp(self):
+        super().setUp()
+        self.add_tasks(5)
+        self.ids = list(Task.objects.order_by("id").values_list("id", flat=True))
+        other = CustomUser.objects.create_user(email="other@example.com")
+        self.foreign = Task.objects.create(
+            title="Other", due_date=datetime.date(2030, 1, 1), owner=other
+        )
+        # Create the TaskStats row so query counts show the steady state
+        self.client.get("/api/tasks/stats/")
+
+    def batch(self, **data):
+        return self.client.post("/api/tasks/batch/", data, format="json")
+
+    def test_complete_reports_per_id_results(self):
+        # Fetch the owned ids, apply the action and adjust TaskStats: three
+        # statements plus the transaction's savepoint pair, for any batch size
+        with self.assertNumQueries(5):
+            response = self.batch(
+                ids=self.ids[:3] + [self.foreign.id, 999999], action="complete"
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["affected"], 3)
+        self.assertEqual(
+            [r["status"] for r in response.data["results"]],
+            ["ok", "ok", "ok", "not_found", "not_found"],
+        )
+        self.assertEqual(
+            set(Task.objects.filter(completed=True).values_list("id", flat=True)),
+            set(self.ids[:3]),
+        )
+
+    def test_reschedule_and_set_priority(self):
+        self.batch(ids=self.ids, action="reschedule", due_date="2031-06-01")
+        self.batch(ids=self.ids[:2], action="set_priority", priority="high")
+
+        tasks = Task.objects.filter(owner=self.user)
+        self.assertEqual(
+            set(tasks.values_list("due_date", flat=True)), {datetime.date(2031, 6, 1)}
+        )
+        self.assertEqual(tasks.filter(priority="high").count(), 2)
+
+    def test_delete_keeps_other_users_tasks(self):
+        self.client.get("/api/tasks/list/")
+
+        response = self.batch(ids=self.ids + [self.foreign.id], action="delete")
+
+        self.assertEqual(response.data["affected"], 5)
+        self.assertTrue(Task.objects.filter(id=self.foreign.id).exists())
+        self.assertEqual(self.client.get("/api/tasks/list/").data["count"], 0)
+
+    def test_action_arguments_are_required(self):
+        response = self.batch(ids=self.ids, action="reschedule")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("due_date", response.data)
+
+    def test_single_toggle_writes_only_completion(self):
+        task = Task.objects.get(id=self.ids[0])
+
+        # One narrow UPDATE for the task and one for TaskStats, plus the
+        # transaction's savepoint pair
+        with self.assertNumQueries(4):
+            task.mark_as_completed()
+        Task.objects.filter(id=task.id).update(title="Renamed elsewhere")
+        task.mark_as_incomplete()
+
+        task.refresh_from_db()
+        self.assertFalse(task.completed)
+        self.assertEqual(task.title, "Renamed elsewhere")
+
+
+class TaskStatsTests(TaskTestCase):
+    def setUp(self):
+        super().setUp()
+        self.add_tasks(4)
+        self.add_tasks(2, completed=True, priority="high")
+        self.ids = list(Task.objects.order_by("id").values_list("id", flat=True))
+
+    def stats(self):
+        return self.client.get("/api/tasks/stats/").data
+
+    def assertStatsMatchTasks(self):
+        fields = ("total", "completed", "high", "medium", "low")
+        stored = TaskStats.objects.values_list(*fields).get(owner=self.user)
+        call_command("rebuild_task_stats", stdout=StringIO())
+        rebuilt = TaskStats.objects.values_list(*fields).get(owner=self.user)
+        self.assertEqual(stored, rebuilt)
+
+    def test_stats_endpoint(self):
+        self.assertEqual(
+            self.stats(),
+            {
+                "total": 6,
+                "completed": 2,
+                "pending": 4,
+                "overdue": 0,
+                "by_priority": {"high": 2, "medium": 4, "low": 0},
+            },
+        )
+
+        # The stored row plus the overdue index count, independent of task volume
+        with self.assertNumQueries(2):
+            self.stats()
+
+    def test_overdue_counts_pending_past_tasks(self):
+        Task.objects.create(
+            title="Late", due_date=datetime.date(2000, 1, 1), owner=self.user
+        )
+        Task.objects.create(
+            title="Done",
+            due_date=datetime.date(2000, 1, 1),
+            owner=self.user,
+            completed=True,
+        )
+        self.assertEqual(self.stats()["overdue"], 1)
+
+    def test_single_task_paths_update_incrementally(self):
+        self.stats()
+
+        response = self.client.post(
+            "/api/tasks/create/",
+            {"title": "New", "due_date": "2030-02-01", "priority": "low"},
+            format="json",
+        )
+        new_id = response.data["id"]
+        self.client.post(f"/api/tasks/{new_id}/complete/")
+        self.client.put(
+            f"/api/tasks/{self.ids[0]}/",
+            {"title": "Edited", "due_date": "2030-03-01", "priority": "high"},
+            format="json",
+        )
+        self.client.post(f"/api/tasks/{self.ids[4]}/incomplete/")
+        self.client.delete(f"/api/tasks/{self.ids[5]}/")
+
+        stats = self.stats()
+        self.assertEqual((stats["total"], stats["completed"]), (6, 1))
+        self.assertEqual(stats["by_priority"], {"high": 2, "medium": 3, "low": 1})
+        self.assertStatsMatchTasks()
+
+    def test_batch_paths_update_incrementally(self):
+        self.stats()
+        batch = [
+            {"ids": self.ids[:3], "action": "complete"},
+            {"ids": self.ids[2:], "action": "set_priority", "priority": "low"},
+            {"ids": self.ids[4:], "action": "incomplete"},
+            {"ids": self.ids[:2], "action": "delete"},
+        ]
+        for data in batch:
+            self.client.post("/api/tasks/batch/", data, format="json")
+
+        stats = self.stats()
+        self.assertEqual((stats["total"], stats["completed"]), (4, 1))
+        self.assertEqual(stats["by_priority"], {"high": 0, "medium": 0, "low": 4})
+        self.assertStatsMatchTasks()
+
+    def test_concurrent_writes_count_once(self):
+        self.stats()
+        # Two requests loaded the same pending task before either wrote
+        first = Task.objects.get(id=self.ids[0])
+        second = Task.objects.get(id=self.ids[0])
+        first.mark_as_completed()
+        second.mark_as_completed()
+        self.assertEqual(self.stats()["completed"], 3)
+        self.assertStatsMatchTasks()
+
+        second.mark_as_incomplete()
+        # A full save from a copy that still believes the task is completed
+        first.title = "Saved from a stale copy"
+        first.save()
+        self.assertEqual(self.stats()["completed"], 3)
+        self.assertStatsMatchTasks()
+
+    def test_queryset_deletes_update_stats(self):
+        self.stats()
+        Task.objects.filter(id__in=self.ids[3:]).delete()
+
+        stats = self.stats()
+        self.assertEqual((stats["total"], stats["completed"]), (3, 0))
+        self.assertStatsMatchTasks()
+
+    def test_rebuild_repairs_drift(self):
+        self.stats()
+        TaskStats.objects.filter(owner=self.user).update(total=999, low=5)
+
+        call_command("rebuild_task_stats", stdout=StringIO())
+
+        self.assertEqual(self.stats()["total"], 6)
+        self.assertEqual(self.stats()["by_priority"]["low"], 0)
+
+
+class TaskConditionalGetTests(TaskTestCase):
+    def setUp(self):
+        super().setUp()
+        self.add_tasks(6)
+        self.task = Task.objects.first()
+        # Any write creates the owner's TaskStats row, which holds the version
+        self.task.mark_as_completed()
+
+    def test_unchanged_list_is_not_modified(self):
+        response = self.client.get("/api/tasks/list/")
+        etag = response["ETag"]
+
+        # Only the version lookup runs; nothing is listed or serialized
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/tasks/list/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+
+    def test_views_without_validator_skip_etags(self):
+        class PlainTaskListView(ConditionalGetMixin, generics.ListAPIView):
+            queryset = Task.objects.order_by("id")
+            serializer_class = TaskSerializer
+
+        request = APIRequestFactory().get("/api/tasks/list/")
+        force_authenticate(request, self.user)
+        response = PlainTaskListView.as_view()(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header("ETag"))
+
+    def test_writes_change_the_etag(self):
+        etag = self.client.get("/api/tasks/list/")["ETag"]
+        writes = [
+            lambda: self.client.post(f"/api/tasks/{self.task.id}/incomplete/"),
+            lambda: self.client.patch(
+                f"/api/tasks/{self.task.id}/", {"title": "Renamed"}, format="json"
+            ),
+            lambda: self.client.post(
+                "/api/tasks/batch/",
+                {
+                    "ids": [self.task.id],
+                    "action": "reschedule",
+                    "due_date": "2031-01-01",
+                },
+                format="json",
+            ),
+        ]
+        for write in writes:
+            write()
+            response = self.client.get("/api/tasks/list/", HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 200)
+            etag = response["ETag"]
+
+    def test_etag_depends_on_query(self):
+        first = self.client.get("/api/tasks/list/?page=1")["ETag"]
+        response = self.client.get("/api/tasks/list/?page=2", HTTP_IF_NONE_MATCH=first)
+        self.assertEqual(response.status_code, 200)
+
+    def test_detail_is_not_modified(self):
+        url = f"/api/tasks/{self.task.id}/"
+        etag = self.client.get(url)["ETag"]
+        self.assertEqual(
+            self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304
+        )
+
+
+@unittest.skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN is SQLite's")
+class TaskQueryPlanTests(TaskTestCase):
+    # Every task query must be an index search: no table scan, no separate sort step
+    def setUp(self):
+        super().setUp()
+        self.add_tasks(50)
+        self.add_tasks(50, completed=True)
+        # Other users' tasks, so the statistics reflect a shared table
+        other = CustomUser.objects.create_user(email="other@example.com")
+        Task.objects.bulk_create(
+            Task(title="Other", due_date=datetime.date(2030, 1, 1), owner=other)
+            for _ in range(400)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def view_queryset(self, view_class, query="", **kwargs):
+        request = APIRequestFactory().get(f"/?{query}")
+        force_authenticate(request, self.user)
+        view = view_class()
+        view.setup(view.initialize_request(request), **kwargs)
+        view.format_kwarg = None
+        return view.get_queryset()
+
+    def assertIndexSearch(self, queryset):
+        plan = queryset.explain()
+        for line in plan.splitlines():
+            self.assertNotRegex(line, r"\bSCAN\b", plan)
+            self.assertNotIn("TEMP B-TREE", line, plan)
+
+    def test_list(self):
+        self.assertIndexSearch(self.view_queryset(TaskListView)[:5])
+
+    def test_list_filtered_by_completion(self):
+        for value in ("true", "false"):
+            with self.subTest(completed=value):
+                queryset = self.view_queryset(TaskListView, f"completed={value}")
+                self.assertIndexSearch(queryset[:5])
+
+    def test_list_cursor_page(self):
+        after = TaskCursorPagination().after(["2030-01-05", "12"])
+        for query in ("", "completed=false"):
+            with self.subTest(query=query):
+                queryset = self.view_queryset(TaskListView, query).filter(after)
+                self.assertIndexSearch(queryset[:5])
+
+    def test_list_count(self):
+        self.assertIndexSearch(Task.objects.filter(owner=self.user))
+        self.assertIndexSearch(Task.objects.filter(owner=self.user, completed=True))
+
+    def test_overdue_count(self):
+        self.assertIndexSearch(
+            Task.objects.filter(
+                owner=self.user, completed=False, due_date__lt=datetime.date(2030, 1, 10)
+            )
+        )
+
+    def test_detail_and_toggles(self):
+        # TaskDetailView, TaskCompleteView and TaskInCompleteView look up (pk, owner)
+        task = Task.objects.first()
+        self.assertIndexSearch(
+            self.view_queryset(TaskDetailView, pk=task.pk).filter(pk=task.pk)
+        )
+        self.assertIndexSearch(Task.objects.filter(pk=task.pk, owner=self.user))
+
+
+class FastJSONTests(TaskTestCase):
+    def test_renders_like_stock_renderer(self):
+        self.add_tasks(3, description="Notes with a line\u2028separator é")
+
+        for url in ("/api/tasks/list/", "/api/tasks/stats/"):
+            with self.subTest(url=url):
+                data = self.client.get(url).data
+                self.assertEqual(
+                    FastJSONRenderer().render(data), JSONRenderer().render(data)
+                )
+
+    def test_malformed_body_is_rejected(self):
+        response = self.client.post(
+            "/api/tasks/batch/", "{", content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("JSON parse error", response.json()["detail"])
+
+
+class CompiledSerializerTests(TaskTestCase):
+    def setUp(self):
+        super().setUp()
+        self.add_tasks(4, description="Notes — été")
+        self.add_tasks(2, description=None, priority="high", completed=True)
+        self.add_tasks(1, description="")
+
+    def test_rows_render_like_instances(self):
+        Task.objects.filter(description=None).update(
+            created_at=datetime.datetime(
+                2030, 1, 1, 23, 59, 59, 999999, tzinfo=datetime.timezone.utc
+            )
+        )
+        queryset = Task.objects.order_by("id")
+        for zone in ("UTC", "Asia/Kolkata"):
+            with self.subTest(zone=zone), timezone.override(zone):
+                expected = TaskSerializer(queryset, many=True).data
+                rows = TaskSerializer(TaskSerializer.read_rows(queryset), many=True)
+                self.assertEqual(
+                    JSONRenderer().render(rows.data), JSONRenderer().render(expected)
+                )
+
+    def test_list_renders_like_instances(self):
+        expected = json.loads(
+            JSONRenderer().render(
+                TaskSerializer(Task.objects.order_by("due_date", "id"), many=True).data
+            )
+        )
+        pages = [
+            self.client.get("/api/tasks/list/?page_size=3&page=2").json(),
+            self.client.get("/api/tasks/list/?cursor=&page_size=3").json(),
+        ]
+        self.assertEqual(pages[0]["results"], expected[3:6])
+        self.assertEqual(pages[1]["results"], expected[:3])
 
-# Create your tests here.
+        # The next cursor is read from the last row
+        page = self.client.get(pages[1]["next"]).json()
+        self.assertEqual(page["results"], expected[3:6])
@@ -5,11 +5,15 @@ from .views import (
     TaskDetailView,
     TaskCompleteView,
     TaskInCompleteView,
+    TaskBatchView,
+    TaskStatsView,
 )
 
 urlpatterns = [
     path("create/", TaskCreateView.as_view(), name="task-create"),
     path("list/", TaskListView.as_view(), name="task-list"),
+    path("batch/", TaskBatchView.as_view(), name="task-batch"),
+    path("stats/", TaskStatsView.as_view(), name="task-stats"),
     path("<int:pk>/", TaskDetailView.as_view(), name="task-detail"),
     path("<int:pk>/complete/", TaskCompleteView.as_view(), name="task-complete"),
     path("<int:pk>/incomplete/", TaskInCompleteView.as_view(), name="task-incomplete"),
@@ -1,11 +1,16 @@
 from rest_framework import generics, permissions, status
 from .models import Task
-from .serializers import TaskSerializer
-from django.db.models import F
+from .serializers import TaskSerializer, TaskBatchSerializer
+from .counts import task_count
+from .stats import get_stats, get_version, record_changes
+from .pagination import TaskPagination, TaskCursorPagination
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework.pagination import PageNumberPagination
 from django.core.exceptions import PermissionDenied
+from django.db import transaction
+from django.utils import timezone
+from core.compiled import CompiledListMixin
+from core.conditional import ConditionalGetMixin
 
 
 class TaskCreateView(generics.CreateAPIView):
@@ -17,52 +22,54 @@ class TaskCreateView(generics.CreateAPIView):
         serializer.save(owner=self.request.user)
 
 
-class TaskListView(generics.ListAPIView):
+class TaskListView(ConditionalGetMixin, CompiledListMixin, generics.ListAPIView):
+    # ?page=N (default) returns page-numbered results with totals; ?cursor= switches
+    # to keyset pagination on (due_date, id). Both accept a capped ?page_size=.
     serializer_class = TaskSerializer
     permission_classes = [permissions.IsAuthenticated]
-    pagination_class = PageNumberPagination
 
-    def get_queryset(self):
+    @property
+    def paginator(self):
+        if not hasattr(self, "_paginator"):
+            if "cursor" in self.request.query_params:
+                self._paginator = TaskCursorPagination()
+            else:
+                self._paginator = TaskPagination()
+        return self._paginator
+
+    def get_completed_filter(self):
         completed_param = self.request.query_params.get("completed")
+        if completed_param is None:
+            return None
+        return completed_param.lower() in ["true", "1", "yes"]
+
+    def get_queryset(self):
+        completed_value = self.get_completed_filter()
 
         queryset = Task.objects.filter(owner=self.request.user)
 
-        if completed_param is not None:
-            completed_value = completed_param.lower() in ["true", "1", "yes"]
+        if completed_value is not None:
             queryset = queryset.filter(completed=completed_value)
 
-        return queryset.order_by(F("due_date").asc(nulls_last=True))
+        return queryset.order_by("due_date", "id")
 
-    def list(self, request, *args, **kwargs):
-        queryset = self.filter_queryset(self.get_queryset())
-        page = self.paginate_queryset(queryset)
+    def get_total_count(self):
+        return task_count(self.request.user.id, self.get_completed_filter())
 
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
-
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
-
-    def get_paginated_response(self, data):
-        paginator = self.paginator
-        return Response(
-            {
-                "count": paginator.page.paginator.count,
-                "total_pages": paginator.page.paginator.num_pages,
-                "current_page": paginator.page.number,
-                "results": data,
-            }
-        )
+    def get_etag_validator(self):
+        return get_version(self.request.user.id)
 
 
-class TaskDetailView(generics.RetrieveUpdateDestroyAPIView):
+class TaskDetailView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = TaskSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
         return Task.objects.filter(owner=self.request.user)
 
+    def get_etag_validator(self):
+        return get_version(self.request.user.id)
+
 
 class TaskCompleteView(APIView):
     permission_classes = [permissions.IsAuthenticated]
@@ -100,3 +107,69 @@ class TaskInCompleteView(APIView):
                 {"error": "Task not found or you don't have permission"},
                 status=status.HTTP_404_NOT_FOUND,
             )
+
+
+class TaskBatchView(generics.GenericAPIView):
+    # Applies one action to many tasks with a single UPDATE/DELETE; ids the user
+    # does not own are reported as not_found
+    serializer_class = TaskBatchSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        action = data["action"]
+
+        with transaction.atomic():
+            queryset = Task.objects.filter(owner=request.user, id__in=data["ids"])
+            rows = queryset.select_for_update().values_list(
+                "id", "completed", "priority"
+            )
+            states = {
+                pk: (request.user.id, completed, priority)
+                for pk, completed, priority in rows
+            }
+
+            if action == "delete":
+                # TaskQuerySet.delete() applies the stats itself
+                queryset.delete()
+            else:
+                updates = {
+                    "complete": {"completed": True},
+                    "incomplete": {"completed": False},
+                    "set_priority": {"priority": data.get("priority")},
+                    "reschedule": {"due_date": data.get("due_date")},
+                }[action]
+                queryset.update(**updates, updated_at=timezone.now())
+                changes = [
+                    (
+                        state,
+                        (
+                            state[0],
+                            updates.get("completed", state[1]),
+                            updates.get("priority", state[2]),
+                        ),
+                    )
+                    for state in states.values()
+                ]
+                # update() skips Task.save, so apply the stats here
+                record_changes(changes)
+
+        return Response(
+            {
+                "action": action,
+                "affected": len(states),
+                "results": [
+                    {"id": pk, "status": "ok" if pk in states else "not_found"}
+                    for pk in dict.fromkeys(data["ids"])
+                ],
+            }
+        )
+
+
+class TaskStatsView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        return Response(get_stats(request.user.id))
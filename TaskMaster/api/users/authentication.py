@@ -0,0 +1,51 @@
+from django.core.cache import caches
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+from .revocation import revocations
+
+
+def _cache_key(user_id):
+    return f"auth:user:{user_id}"
+
+
+def invalidate_cached_user(user_id):
+    caches["auth"].delete(_cache_key(user_id))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    # JWTAuthentication that keeps the user in the bounded "auth" cache for an
+    # access token lifetime; users.signals drops the entry when the user changes.
+
+    def get_validated_token(self, raw_token):
+        validated_token = super().get_validated_token(raw_token)
+        # Logged-out tokens; an in-memory lookup, see users.revocation
+        if revocations.is_revoked(validated_token.get(api_settings.JTI_CLAIM)):
+            raise InvalidToken(_("Token has been revoked"))
+        return validated_token
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+
+        cache = caches["auth"]
+        user = cache.get(_cache_key(user_id))
+        if user is None:
+            user = super().get_user(validated_token)
+            cache.set(
+                _cache_key(user_id),
+                user,
+                api_settings.ACCESS_TOKEN_LIFETIME.total_seconds(),
+            )
+            return user
+
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+            api_settings.REVOKE_TOKEN_CLAIM
+        ) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(
+                _("The user's password has been changed."), code="password_changed"
+            )
+        return user
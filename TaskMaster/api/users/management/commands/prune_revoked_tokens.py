@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from users.models import RevokedToken
+
+
+class Command(BaseCommand):
+    help = "Delete revoked token records whose tokens have expired"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=None,
+            help="Keep sweeping every INTERVAL seconds",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            deleted, _ = RevokedToken.objects.filter(
+                expires_at__lte=timezone.now()
+            ).delete()
+            if deleted or options["verbosity"] > 1:
+                self.stdout.write(f"Pruned {deleted} revoked tokens")
+            if options["interval"] is None:
+                return
+            time.sleep(options["interval"])
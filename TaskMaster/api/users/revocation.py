@@ -0,0 +1,65 @@
+import threading
+import time
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework_simplejwt.utils import datetime_from_epoch
+from .models import RevokedToken
+
+
+class RevocationList:
+    # Process-local mirror of RevokedToken, so checking a token is a dict lookup.
+    # New rows written by other processes are picked up with one query at most every
+    # TOKEN_REVOCATION_SYNC_INTERVAL seconds; that interval is how long a logout can
+    # take to reach every process.
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self._expires = {}
+        self._last_id = 0
+        self._synced_at = None
+
+    def is_revoked(self, jti):
+        self.sync()
+        return jti in self._expires
+
+    def revoke(self, token):
+        jti = token["jti"]
+        RevokedToken.objects.get_or_create(
+            jti=jti, defaults={"expires_at": datetime_from_epoch(token["exp"])}
+        )
+        # Under the lock, or a concurrent _load() could swap in a dict without it
+        with self._lock:
+            self._expires[jti] = token["exp"]
+
+    def sync(self, force=False):
+        if force or self._stale():
+            with self._lock:
+                if force or self._stale():
+                    self._load()
+
+    def _stale(self):
+        return (
+            self._synced_at is None
+            or time.monotonic() - self._synced_at
+            >= settings.TOKEN_REVOCATION_SYNC_INTERVAL
+        )
+
+    def _load(self):
+        # Pick up rows added since the last sync and forget expired entries
+        now = time.time()
+        expires = {jti: exp for jti, exp in self._expires.items() if exp > now}
+        rows = RevokedToken.objects.filter(
+            id__gt=self._last_id, expires_at__gt=timezone.now()
+        ).values_list("id", "jti", "expires_at")
+        for pk, jti, expires_at in rows:
+            expires[jti] = expires_at.timestamp()
+            self._last_id = max(self._last_id, pk)
+        self._expires = expires
+        self._synced_at = time.monotonic()
+
+
+revocations = RevocationList()
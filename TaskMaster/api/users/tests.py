@@ -1,3 +1,209 @@
+import os
+import tempfile
+import unittest
+from io import StringIO
+
+from django.contrib.auth.hashers import make_password
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.utils import timezone
+from django.db import connection, connections
 from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .models import CustomUser, RevokedToken
+from .revocation import revocations
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        caches["auth"].clear()
+        self.user = CustomUser.objects.create_user(
+            email="user@example.com", password=None
+        )
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}"
+        )
+
+    def test_cached_user_costs_no_auth_queries(self):
+        self.client.get("/api/tasks/999/")
+
+        # Only the ETag version and task lookups remain once the user is cached
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/tasks/999/")
+        self.assertEqual(response.status_code, 404)
+
+    def test_deactivated_user_is_rejected(self):
+        self.client.get("/api/tasks/999/")
+
+        self.user.is_active = False
+        self.user.save()
+
+        self.assertEqual(self.client.get("/api/tasks/999/").status_code, 401)
+
+
+class PasswordHashingTests(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(email="user@example.com")
+
+    def login(self):
+        return APIClient().post(
+            "/api/auth/login/",
+            {"email": "user@example.com", "password": "secret-pass"},
+            format="json",
+        )
+
+    def test_legacy_hash_is_upgraded_on_login(self):
+        self.user.password = make_password("secret-pass", hasher="pbkdf2_sha256")
+        self.user.save()
+
+        self.assertEqual(self.login().status_code, 200)
+
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith("scrypt$16384$"))
+
+    def test_changed_parameters_are_applied_on_login(self):
+        self.user.set_password("secret-pass")
+        self.user.save()
+
+        scrypt = {"WORK_FACTOR": 2**12, "BLOCK_SIZE": 8, "PARALLELISM": 1}
+        with self.settings(PASSWORD_SCRYPT=scrypt):
+            self.assertEqual(self.login().status_code, 200)
+
+        self.user.refresh_from_db()
+        _, work_factor, _, block_size, parallelism, _ = self.user.password.split("$")
+        self.assertEqual((work_factor, block_size, parallelism), ("4096", "8", "1"))
+
+
+class TokenRevocationTests(TestCase):
+    def setUp(self):
+        caches["auth"].clear()
+        revocations.reset()
+        CustomUser.objects.create_user(email="user@example.com", password="secret-pass")
+        self.client = APIClient()
+        self.tokens = self.client.post(
+            "/api/auth/login/",
+            {"email": "user@example.com", "password": "secret-pass"},
+            format="json",
+        ).data
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.tokens['access']}")
+
+    def logout(self):
+        return self.client.post(
+            "/api/auth/logout/", {"refresh": self.tokens["refresh"]}, format="json"
+        )
+
+    def test_logout_revokes_refresh_and_access_tokens(self):
+        self.assertEqual(self.logout().status_code, 200)
+        self.assertEqual(RevokedToken.objects.count(), 2)
+
+        # The revocation check itself is an in-memory lookup once synced
+        revocations.sync()
+        with self.assertNumQueries(0):
+            response = self.client.get("/api/tasks/list/")
+        self.assertEqual(response.status_code, 401)
+
+        response = APIClient().post(
+            "/api/auth/refresh/", {"refresh": self.tokens["refresh"]}, format="json"
+        )
+        self.assertEqual(response.status_code, 401)
+
+    def test_logout_with_expired_access_token(self):
+        access = AccessToken(self.tokens["access"])
+        access.set_exp(lifetime=-timedelta(minutes=1))
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+
+        self.assertEqual(self.logout().status_code, 200)
+        self.assertTrue(RevokedToken.objects.filter(jti=access["jti"]).exists())
+        response = APIClient().post(
+            "/api/auth/refresh/", {"refresh": self.tokens["refresh"]}, format="json"
+        )
+        self.assertEqual(response.status_code, 401)
+
+    def test_logout_ignores_forged_access_token(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer not-a-token")
+        self.assertEqual(self.logout().status_code, 200)
+        self.assertEqual(RevokedToken.objects.count(), 1)
+
+    def test_refresh_works_until_logout(self):
+        response = self.client.post(
+            "/api/auth/refresh/", {"refresh": self.tokens["refresh"]}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("access", response.data)
+
+    def test_revocations_from_other_processes_are_synced(self):
+        self.client.get("/api/tasks/list/")
+        # Another process logged this token out
+        RevokedToken.objects.create(
+            jti=AccessToken(self.tokens["access"])["jti"],
+            expires_at=timezone.now() + timedelta(hours=1),
+        )
+
+        revocations.sync(force=True)
+        self.assertEqual(self.client.get("/api/tasks/list/").status_code, 401)
+
+    def test_logout_rejects_invalid_token(self):
+        response = self.client.post(
+            "/api/auth/logout/", {"refresh": "not-a-token"}, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_prune_deletes_only_expired_records(self):
+        self.logout()
+        RevokedToken.objects.create(
+            jti="expired", expires_at=timezone.now() - timedelta(seconds=1)
+        )
+
+        out = StringIO()
+        call_command("prune_revoked_tokens", stdout=out)
+
+        self.assertEqual(out.getvalue(), "Pruned 1 revoked tokens\n")
+        self.assertEqual(RevokedToken.objects.count(), 2)
+        self.assertFalse(RevokedToken.objects.filter(jti="expired").exists())
+
+
+@unittest.skipUnless(connection.vendor == "sqlite", "SQLite profile")
+class SQLiteProfileTests(TestCase):
+    def connect(self, directory):
+        # A fresh connection to a file database, so journal_mode=wal can apply
+        settings_dict = {
+            **connections["default"].settings_dict,
+            "NAME": os.path.join(directory, "db.sqlite3"),
+        }
+        wrapper = type(connections["default"])(settings_dict, alias="profile-test")
+        try:
+            wrapper.ensure_connection()
+            return {
+                name: wrapper.connection.execute(f"PRAGMA {name}").fetchone()[0]
+                for name in ("journal_mode", "synchronous", "busy_timeout", "mmap_size")
+            }
+        finally:
+            wrapper.close()
+
+    def test_new_connections_are_tuned(self):
+        with tempfile.TemporaryDirectory() as directory:
+            pragmas = self.connect(directory)
+
+        self.assertEqual(
+            pragmas,
+            {
+                "journal_mode": "wal",
+                "synchronous": 1,  # NORMAL
+                "busy_timeout": settings.SQLITE_PRAGMAS["busy_timeout"],
+                "mmap_size": settings.SQLITE_PRAGMAS["mmap_size"],
+            },
+        )
 
-# Create your tests here.
+    def test_rejects_malformed_pragma_values(self):
+        pragmas = {**settings.SQLITE_PRAGMAS, "synchronous": "off; DROP TABLE x"}
+        with tempfile.TemporaryDirectory() as directory:
+            with self.settings(SQLITE_PRAGMAS=pragmas):
+                with self.assertRaises(ImproperlyConfigured):
+                    self.connect(directory)
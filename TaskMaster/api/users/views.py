@@ -1,9 +1,17 @@
 from rest_framework import generics, status
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
-from .serializers import UserRegistrationSerializer, UserLoginSerializer
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import ExpiredTokenError, TokenError
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+from rest_framework_simplejwt.views import TokenRefreshView
+from .revocation import revocations
+from .serializers import (
+    UserRegistrationSerializer,
+    UserLoginSerializer,
+    LogoutSerializer,
+    RefreshSerializer,
+)
 from django.contrib.auth import authenticate
-from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 
@@ -41,11 +49,47 @@ class LoginView(generics.GenericAPIView):
             )
 
 
-class LogoutView(APIView):
+class RefreshView(TokenRefreshView):
+    serializer_class = RefreshSerializer
+
+
+class LogoutView(generics.GenericAPIView):
+    # Revokes the refresh token, and the access token the request was made with.
+    # Nothing is authenticated: logging out must work with an expired access token.
+    serializer_class = LogoutSerializer
+    authentication_classes = []
+    permission_classes = []
+
     def post(self, request):
-        try:
-            return Response({"detail": "Successfully logged out."})
-        except Exception:
+        serializer = self.get_serializer(data=request.data)
+        if not serializer.is_valid():
             return Response(
                 {"detail": "Error logging out"}, status=status.HTTP_400_BAD_REQUEST
             )
+
+        refresh = serializer.validated_data["refresh"]
+        access = self.get_access_token(request)
+        if access is not None and refresh["user_id"] != access.get("user_id"):
+            return Response(
+                {"detail": "Error logging out"}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        revocations.revoke(refresh)
+        if access is not None:
+            revocations.revoke(access)
+        return Response({"detail": "Successfully logged out."})
+
+    def get_access_token(self, request):
+        # Best effort: an expired token is still revoked, an invalid one ignored
+        authentication = JWTAuthentication()
+        header = authentication.get_header(request)
+        raw_token = authentication.get_raw_token(header) if header else None
+        if raw_token is None:
+            return None
+        try:
+            return AccessToken(raw_token)
+        except ExpiredTokenError:
+            # The signature is checked before the expiry, so it is valid here
+            return AccessToken(raw_token, verify=False)
+        except TokenError:
+            return None
@@ -25,7 +25,7 @@ function Login() {
 
             if (response.ok) {
                 const data = await response.json();
-                login(data.access, email); // 👈 Usa la función login del contexto
+                login(data.access, email, data.refresh); // 👈 Usa la función login del contexto
                 navigate('/');
             } else {
                 const errorData = await response.json();
@@ -37,7 +37,7 @@ function Register() {
 
                     if (loginResponse.ok) {
                         const loginData = await loginResponse.json();
-                        login(loginData.access, email); // 👈 Usar login del contexto
+                        login(loginData.access, email, loginData.refresh); // 👈 Usar login del contexto
                         navigate('/');
                     } else {
                         setMessage('Registration successful! Please login.');
@@ -24,13 +24,28 @@ export function AuthProvider({ children }) {
         setLoading(false);
     }, []);
 
-    const login = (token, email) => {
+    const login = (token, email, refresh) => {
         localStorage.setItem('access_token', token);
+        localStorage.setItem('refresh_token', refresh);
         localStorage.setItem('user_email', email);
         setCurrentUser({ token, email });
     };
 
     const logout = () => {
+        // Revoke the tokens server-side; local state is cleared either way
+        const token = localStorage.getItem('access_token');
+        const refresh = localStorage.getItem('refresh_token');
+        if (refresh) {
+            fetch('http://localhost:8000/api/auth/logout/', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                    'Authorization': `Bearer ${token}`
+                },
+                body: JSON.stringify({ refresh })
+            }).catch(() => {});
+        }
+
         localStorage.removeItem('access_token');
         localStorage.removeItem('refresh_token');
         localStorage.removeItem('user_email');
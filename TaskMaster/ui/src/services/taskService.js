@@ -96,4 +96,35 @@ export const incompleteTask = async (id, token) => {
     }
 
     return await response.json();
-};
\ No newline at end of file
+};
+// action: 'complete' | 'incomplete' | 'delete' | 'set_priority' | 'reschedule'
+export const batchTasks = async (ids, action, token, extra = {}) => {
+    const response = await fetch(`${API_URL}/batch/`, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+            'Authorization': `Bearer ${token}`
+        },
+        body: JSON.stringify({ ids, action, ...extra })
+    });
+
+    if (!response.ok) {
+        throw new Error('Failed to update tasks');
+    }
+
+    return await response.json();
+};
+
+export const getTaskStats = async (token) => {
+    const response = await fetch(`${API_URL}/stats/`, {
+        headers: {
+            'Authorization': `Bearer ${token}`
+        }
+    });
+
+    if (!response.ok) {
+        throw new Error('Failed to fetch task stats');
+    }
+
+    return await response.json();
+};